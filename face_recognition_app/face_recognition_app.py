@@ -1,13 +1,74 @@
-import sys, os, cv2, json, pandas as pd
+import sys, os, json, pandas as pd
 from datetime import datetime
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout
 from PyQt5.QtGui import QImage, QPixmap, QFont
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal
 import face_recognition
 import time
 import uuid
+from modules.encoding_cache import EncodingCache, scan_face_images, diff_snapshots
+from modules.face_matchers import make_matcher
+from modules.recognition_pipeline import RecognitionPipeline
+from modules.face_detection import DEFAULT_MIN_FACE_PX, detect_faces_scaled, resolve_detection_scale
+from modules.face_tracker import FaceTracker
+from modules.recognition_throttle import RecognitionThrottle
+from modules.motion_gate import MotionGate
+from modules.camera_capture import CameraCapture
+from modules.event_log import EventLogWriter, EVENT_LOG_DIRNAME
+from modules.event_channel import EventPublisher, default_address, load_authkey
+from modules.presence_index import PresenceIndex, store_ids, store_version
+
+# Defaults; override any key in shared/face_app_config.json
+DEFAULT_CONFIG = {
+    "matcher_backend": "exact",   # "exact" or "ivf" (approximate, for very large galleries)
+    "matcher_options": {"n_lists": None, "n_probe": 8},
+    "detection_scale": "auto",    # 0.25-1.0, or "auto" to derive it from min_face_px
+    "min_face_px": DEFAULT_MIN_FACE_PX,  # smallest face height (full-res pixels) at the kiosk distance
+    "detection_upsample": 1,
+    "match_threshold": 0.6,
+    "reverify_seconds": 2.0,      # re-encode a recognized track this often to confirm identity
+    "motion_gate": True,          # only run detection while something moves in front of the camera
+    "active_interval_ms": 30,     # camera poll interval while there is motion
+    "idle_interval_ms": 250,      # camera poll interval while the entrance is empty
+    "camera_index": 0,
+    "capture_width": None,        # None keeps the driver default
+    "capture_height": None,
+    "capture_fps": None,
+    "capture_fourcc": "MJPG",     # compressed USB transfer, cheaper than raw YUYV at HD sizes
+    "push_events": True,          # also push events to a running dashboard; the file log is always written
+    "attendance_db": "../streamlit_app/data/attendance.db",  # the dashboard's store, relative to this folder
+}
+
+class GalleryReloadWorker(QThread):
+    """Rebuild the face gallery off the GUI thread and hand it back via a signal"""
+    gallery_ready = pyqtSignal(object, object)
+    # Carries the folder snapshot from before the change, so the next poll sees it again
+    reload_failed = pyqtSignal(object)
+
+    def __init__(self, encoding_cache, known_dir, encode_fn, build_fn, changes, previous_files):
+        super().__init__()
+        self.encoding_cache = encoding_cache
+        self.known_dir = known_dir
+        self.encode_fn = encode_fn
+        self.build_fn = build_fn
+        self.changes = changes
+        self.previous_files = previous_files
+
+    def run(self):
+        try:
+            # Only added/modified images are encoded; removed ones are dropped
+            faces, ids = self.encoding_cache.sync(self.known_dir, self.encode_fn)
+            gallery = self.build_fn(faces, ids)
+        except Exception as e:
+            print(f"❌ Gallery reload failed: {e}")
+            self.reload_failed.emit(self.previous_files)
+            return
+        self.gallery_ready.emit(gallery, self.changes)
 
 class SimpleFaceApp(QWidget):
+    # Emitted from the recognition worker threads, delivered on the GUI thread
+    recognition_result = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
 
@@ -15,27 +76,34 @@ class SimpleFaceApp(QWidget):
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.shared_dir = os.path.join(self.base_dir, "shared")
         self.emp_csv_path = os.path.join(self.shared_dir, "employees_data.csv")
-        self.json_file = os.path.join(self.shared_dir, "recognized_id.json")
+        self.config_path = os.path.join(self.shared_dir, "face_app_config.json")
 
         os.makedirs(self.shared_dir, exist_ok=True)
+        self.config = self.load_config()
+        self.event_log = EventLogWriter(os.path.join(self.shared_dir, EVENT_LOG_DIRNAME))
+        self.event_publisher = EventPublisher(default_address(self.shared_dir), load_authkey(self.shared_dir)) if self.config.get("push_events", True) else None
+        # Who is already marked today: the dashboard's store, reloaded whenever it is written to
+        self.attendance_db = os.path.normpath(os.path.join(self.base_dir, self.config["attendance_db"]))
+        self.presence = PresenceIndex(
+            lambda day: store_ids(self.attendance_db, day), version_fn=lambda: store_version(self.attendance_db))
 
         # Load employees and faces
         self.employees = self.load_employees()
-        self.known_faces = []
-        self.known_ids = []
-        self.last_known_face_files = set()
-        self.known_faces, self.known_ids = self.load_faces()
-        self.last_known_face_files = set(f for f in os.listdir(os.path.join(self.base_dir, "shared", "known_face")) if f.lower().endswith(('.jpg', '.jpeg')))
-        # Track file/folder modification times
+        self.known_dir = os.path.join(self.shared_dir, "known_face")
+        self.encoding_cache = EncodingCache(self.shared_dir)
+        self.encoding_cache.load()
+        self.last_known_face_files = scan_face_images(self.known_dir)
+        self.gallery = self.build_matcher(*self.load_faces())
+        # Background gallery rebuild state
+        self.reload_worker = None
+        self.pending_changes = None
+        # Track file modification times
         self.last_csv_mtime = os.path.getmtime(self.emp_csv_path) if os.path.exists(self.emp_csv_path) else 0
-        self.known_dir = os.path.join(self.base_dir, "..", "known_face")
-        self.last_known_dir_mtime = self.get_known_dir_mtime()
-        # Recognition tracking - improved duplicate prevention
-        self.last_recognition_time = 0
-        self.recognition_cooldown = 5.0  # Increased to 5 seconds
+        # Recognition tracking - cooldown and count are per person, so a group is marked together
+        self.recognition_cooldown = 5.0  # Seconds before the same person is handled again
         self.last_recognized_id = None
-        self.recognition_count = {}  # Track recognition count per person
         self.max_recognition_per_person = 3  # Max recognitions per person per session
+        self.recognition_throttle = RecognitionThrottle(self.recognition_cooldown, self.max_recognition_per_person)
 
         # UI
         self.setWindowTitle("Simple Face Recognition")
@@ -44,6 +112,7 @@ class SimpleFaceApp(QWidget):
 
         # Camera
         self.capture = None
+        self.last_frame_seq = 0
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         # Timer for checking updates
@@ -53,6 +122,22 @@ class SimpleFaceApp(QWidget):
         # Frame skip for optimization
         self.frame_count = 0
         self.process_every_n_frames = 2  # Only process every 2nd frame
+        # Detect on a downscaled frame; boxes are mapped back to full resolution for encoding
+        self.detection_scale = resolve_detection_scale(self.config)
+        self.detection_upsample = self.config.get("detection_upsample", 1)
+        self.match_threshold = self.config.get("match_threshold", 0.6)
+        # Faces are tracked across frames; only new or due-for-reverification tracks are re-encoded
+        self.tracker = FaceTracker(reverify_seconds=self.config.get("reverify_seconds", 2.0))
+        # Skip detection and slow the camera down while the scene is idle
+        self.motion_gate = MotionGate() if self.config.get("motion_gate", True) else None
+        self.active_interval_ms = self.config.get("active_interval_ms", 30)
+        self.idle_interval_ms = self.config.get("idle_interval_ms", 250)
+        # Capture -> detect -> encode -> match, each stage in its own worker thread
+        self.recognition_result.connect(self.on_recognition_result)
+        self.pipeline = RecognitionPipeline(
+            [("detect", self.detect_faces), ("encode", self.encode_faces), ("match", self.match_faces)],
+            self.recognition_result.emit,
+        )
 
         self.watch_timer = QTimer()
         self.watch_timer.timeout.connect(self.watch_known_face_folder)
@@ -71,75 +156,86 @@ class SimpleFaceApp(QWidget):
             employees = {"MSN001": "Ramsha Tariq", "MSN002": "Tehreem Siddiqui"}
         return employees
 
-    def load_faces(self):
-        faces, ids = [], []
-        known_dir = os.path.join(self.base_dir, "shared", "known_face")
-        for fname in os.listdir(known_dir):
-            if fname.lower().endswith(('.jpg', '.jpeg')):
-                emp_id = os.path.splitext(fname)[0].strip().upper()
-                face_path = os.path.join(known_dir, fname)
-                try:
-                    image = face_recognition.load_image_file(face_path)
-                    encodings = face_recognition.face_encodings(image)
-                    num_faces = len(encodings)
-                    if num_faces == 1:
-                        faces.append(encodings[0])
-                        ids.append(emp_id)
-                    elif num_faces > 1:
-                        faces.append(encodings[0])
-                        ids.append(emp_id)
-                    # else: do nothing if no face
-                except Exception as e:
-                    pass
-        return faces, ids
-
-    def get_known_dir_mtime(self):
+    def load_config(self):
+        config = dict(DEFAULT_CONFIG)
         try:
-            return max(os.path.getmtime(os.path.join(self.known_dir, f)) for f in os.listdir(self.known_dir) if f.endswith('.jpg'))
-        except:
-            return 0
+            if os.path.exists(self.config_path):
+                with open(self.config_path, 'r') as f:
+                    config.update(json.load(f))
+        except Exception as e:
+            print(f"⚠️ Error reading {self.config_path}, using defaults: {e}")
+        return config
+
+    def build_matcher(self, faces, ids):
+        # Exact brute force by default; "ivf" trades a little recall for speed on huge rosters
+        try:
+            return make_matcher(self.config["matcher_backend"], faces, ids, **(self.config.get("matcher_options") or {}))
+        except Exception as e:
+            print(f"⚠️ Matcher backend {self.config.get('matcher_backend')!r} failed, using exact: {e}")
+            return make_matcher("exact", faces, ids)
+
+    def encode_face_file(self, face_path):
+        """Return the first face encoding in an image, or None if no face"""
+        image = face_recognition.load_image_file(face_path)
+        encodings = face_recognition.face_encodings(image)
+        if len(encodings) >= 1:
+            return encodings[0]
+        return None
+
+    def load_faces(self):
+        # Only new or changed images are re-encoded; the rest come from the cache
+        return self.encoding_cache.sync(self.known_dir, self.encode_face_file)
 
     def check_for_updates(self):
-        # Check if CSV or known_face folder has changed
+        # Employee CSV is cheap to reload; face images are handled by the folder watcher
         csv_mtime = os.path.getmtime(self.emp_csv_path) if os.path.exists(self.emp_csv_path) else 0
-        known_dir_mtime = self.get_known_dir_mtime()
-        if csv_mtime != self.last_csv_mtime or known_dir_mtime != self.last_known_dir_mtime:
+        if csv_mtime != self.last_csv_mtime:
             self.last_csv_mtime = csv_mtime
-            self.last_known_dir_mtime = known_dir_mtime
             self.employees = self.load_employees()
-            self.known_faces, self.known_ids = self.load_faces()
-            self.status_label.setText("🔄 Employees/faces reloaded!")
-
-    def encode_and_add_face(self, face_path, emp_id):
-        try:
-            image = face_recognition.load_image_file(face_path)
-            encodings = face_recognition.face_encodings(image)
-            num_faces = len(encodings)
-            if num_faces >= 1:
-                self.known_faces.append(encodings[0])
-                self.known_ids.append(emp_id)
-                self.status_label.setText(f"✅ New encoding added for {emp_id}")
-            # else: do nothing if no face
-        except Exception as e:
-            pass
+            self.status_label.setText("🔄 Employees reloaded!")
+        self.watch_known_face_folder()
 
     def watch_known_face_folder(self):
-        # Watch for new images in known_face and encode only new ones
-        known_dir = os.path.join(self.base_dir, "shared", "known_face")
-        current_files = set(f for f in os.listdir(known_dir) if f.lower().endswith(('.jpg', '.jpeg')))
-        if not hasattr(self, 'last_known_face_files'):
-            self.last_known_face_files = set()
-        new_files = current_files - self.last_known_face_files
-        if new_files:
-            for fname in new_files:
-                emp_id = os.path.splitext(fname)[0].strip().upper()
-                face_path = os.path.join(known_dir, fname)
-                self.encode_and_add_face(face_path, emp_id)
-            self.last_known_face_files = current_files
-        # Also handle removed files (optional: clear encodings if file is deleted)
-        removed_files = self.last_known_face_files - current_files
-        if removed_files:
-            self.last_known_face_files = current_files
+        # Stat-only scan; any added, modified or removed image triggers a background rebuild
+        current_files = scan_face_images(self.known_dir)
+        added, modified, removed = diff_snapshots(self.last_known_face_files, current_files)
+        if added or modified or removed:
+            previous_files, self.last_known_face_files = self.last_known_face_files, current_files
+            self.start_gallery_reload((len(added), len(modified), len(removed)), previous_files)
+
+    def start_gallery_reload(self, changes, previous_files):
+        # Recognition keeps using the current gallery until the worker finishes
+        if self.reload_worker is not None and self.reload_worker.isRunning():
+            # Fold into the next rebuild once the running one finishes
+            if self.pending_changes is None:
+                self.pending_changes = (changes, previous_files)
+            else:
+                # Keep the oldest snapshot: a failed rebuild must retry every change folded into it
+                pending, pending_files = self.pending_changes
+                self.pending_changes = (tuple(p + c for p, c in zip(pending, changes)), pending_files)
+            return
+        self.reload_worker = GalleryReloadWorker(self.encoding_cache, self.known_dir, self.encode_face_file, self.build_matcher, changes, previous_files)
+        self.reload_worker.gallery_ready.connect(self.on_gallery_ready)
+        self.reload_worker.reload_failed.connect(self.on_gallery_reload_failed)
+        self.reload_worker.finished.connect(self.on_gallery_reload_finished)
+        self.reload_worker.start()
+
+    def on_gallery_ready(self, gallery, changes):
+        # Runs on the GUI thread; a single reference swap so update_frame never sees a half-built gallery
+        self.gallery = gallery
+        added, modified, removed = changes
+        self.status_label.setText(f"🔄 Faces reloaded: +{added} ~{modified} -{removed} ({len(gallery)} in gallery)")
+
+    def on_gallery_reload_failed(self, previous_files):
+        # Roll the snapshot back so the next folder poll detects the same change and retries
+        self.last_known_face_files = previous_files
+        self.pending_changes = None
+        self.status_label.setText("❌ Face reload failed - retrying on the next folder check")
+
+    def on_gallery_reload_finished(self):
+        if self.pending_changes is not None:
+            (changes, previous_files), self.pending_changes = self.pending_changes, None
+            self.start_gallery_reload(changes, previous_files)
 
     def init_ui(self):
         # Title
@@ -196,16 +292,30 @@ class SimpleFaceApp(QWidget):
             self.timer.stop()
         if self.capture:
             self.capture.release()
-        self.capture = cv2.VideoCapture(0)
-        if self.capture.isOpened():
-            self.timer.start(30)
+        # Capture thread keeps only the newest frame, so the GUI never reads stale buffered ones
+        self.capture = CameraCapture(
+            self.config.get("camera_index", 0),
+            width=self.config.get("capture_width"),
+            height=self.config.get("capture_height"),
+            fps=self.config.get("capture_fps"),
+            fourcc=self.config.get("capture_fourcc"),
+        )
+        self.last_frame_seq = 0
+        if self.capture.start():
+            self.pipeline.start()
+            if self.motion_gate is not None:
+                self.motion_gate.reset()
+            self.timer.start(self.active_interval_ms)
             self.status_label.setText("Camera started")
         else:
+            self.capture = None
             self.status_label.setText("❌ Cannot open camera!")
 
     def stop_camera(self):
         if self.timer.isActive():
             self.timer.stop()
+        self.pipeline.stop()
+        self.tracker.reset()
         if self.capture:
             self.capture.release()
             self.capture = None
@@ -215,76 +325,101 @@ class SimpleFaceApp(QWidget):
     def update_frame(self):
         if not self.capture:
             return
-        ret, frame = self.capture.read()
-        if not ret or frame is None:
+        seq, frame = self.capture.latest()
+        if frame is None or seq == self.last_frame_seq:
             return
+        self.last_frame_seq = seq
         self.frame_count += 1
-        if self.frame_count % self.process_every_n_frames != 0:
-            qt_image = QImage(frame.data, frame.shape[1], frame.shape[0], QImage.Format_RGB888).rgbSwapped()
-            pixmap = QPixmap.fromImage(qt_image)
-            scaled_pixmap = pixmap.scaled(self.image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.image_label.setPixmap(scaled_pixmap)
-            return
-        rgb_frame = frame[:, :, ::-1]
-        face_locations = face_recognition.face_locations(rgb_frame)
-        if face_locations and self.known_faces:
-            face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
-            current_time = time.time()
-            for face_encoding in face_encodings:
-                face_distances = face_recognition.face_distance(self.known_faces, face_encoding)
-                best_match_index = face_distances.argmin()
-                best_distance = face_distances[best_match_index]
-                best_id = self.known_ids[best_match_index]
-                if best_distance < 0.6 and (current_time - self.last_recognition_time) > self.recognition_cooldown:
-                    emp_id = best_id
-                    name = self.employees.get(emp_id, "Unknown")
-                    if self.is_attendance_already_marked(emp_id):
-                        self.status_label.setText(f"⚠️ {emp_id} ({name}) - Already marked today! (Distance: {best_distance:.3f})")
-                        self.last_recognition_time = current_time
-                        break
-                    if emp_id not in self.recognition_count:
-                        self.recognition_count[emp_id] = 0
-                    if self.recognition_count[emp_id] < self.max_recognition_per_person:
-                        success = self.save_recognition(emp_id, name)
-                        if success:
-                            self.last_recognized_id = emp_id
-                            self.last_recognition_time = current_time
-                            self.recognition_count[emp_id] += 1
-                            self.status_label.setText(f"✅ ATTENDANCE MARKED: {emp_id} ({name}) - {datetime.now().strftime('%H:%M')} (Distance: {best_distance:.3f})")
-                        else:
-                            self.status_label.setText(f"❌ Failed to mark attendance for {emp_id} (Distance: {best_distance:.3f})")
-                        break
-                    else:
-                        self.status_label.setText(f"⚠️ {emp_id} already recognized {self.max_recognition_per_person} times (Distance: {best_distance:.3f})")
-                else:
-                    self.status_label.setText(f"👤 Face detected - Best match: {best_id}, Distance: {best_distance:.3f} (not recognized)")
-        else:
-            self.status_label.setText("Live detection active")
+        active = True
+        if self.motion_gate is not None:
+            # Keep detecting while faces are still tracked, even if they stand still
+            active = self.motion_gate.update(frame, time.time()) or bool(self.tracker.tracks)
+            interval = self.active_interval_ms if active else self.idle_interval_ms
+            if self.timer.interval() != interval:
+                self.timer.setInterval(interval)
+                self.capture.set_min_interval(interval / 1000.0)
+                if not active:
+                    self.status_label.setText("💤 Idle - waiting for motion")
+        if active and self.frame_count % self.process_every_n_frames == 0:
+            # Recognition runs in the worker pipeline; the display never waits for it
+            self.pipeline.submit(frame)
+        self.show_frame(frame)
+
+    def show_frame(self, frame):
         qt_image = QImage(frame.data, frame.shape[1], frame.shape[0], QImage.Format_RGB888).rgbSwapped()
         pixmap = QPixmap.fromImage(qt_image)
         scaled_pixmap = pixmap.scaled(self.image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
         self.image_label.setPixmap(scaled_pixmap)
 
+    # Pipeline stages - called from worker threads, must not touch widgets
+    def detect_faces(self, item):
+        item["rgb_frame"] = item["frame"][:, :, ::-1]
+        item["locations"] = detect_faces_scaled(item["rgb_frame"], self.detection_scale, self.detection_upsample)
+        return item
+
+    def encode_faces(self, item):
+        now = item["timestamp"]
+        item["track_ids"] = self.tracker.update(item["locations"], now)
+        item["encoded_tracks"] = []
+        item["encodings"] = []
+        if item["locations"] and len(self.gallery):
+            to_encode = [(track_id, box) for track_id, box in zip(item["track_ids"], item["locations"])
+                         if self.tracker.needs_encoding(track_id, now)]
+            if to_encode:
+                item["encoded_tracks"] = [track_id for track_id, _ in to_encode]
+                item["encodings"] = face_recognition.face_encodings(item["rgb_frame"], [box for _, box in to_encode])
+        return item
+
+    def match_faces(self, item):
+        # Score every freshly encoded face in one matrix multiply
+        gallery = self.gallery
+        if item["encodings"] and len(gallery):
+            for track_id, match in zip(item["encoded_tracks"], gallery.best_matches(item["encodings"])):
+                if match is not None:
+                    emp_id, distance = match
+                    self.tracker.assign(track_id, emp_id, distance, distance < self.match_threshold, item["timestamp"])
+        # Other tracks carry their last identity forward
+        item["matches"] = [self.tracker.identity(track_id) for track_id in item["track_ids"]]
+        return item
+
+    def on_recognition_result(self, item):
+        # Runs on the GUI thread via the recognition_result signal; every face in the frame is handled
+        matches = [m for m in item["matches"] if m is not None]
+        if not matches:
+            self.status_label.setText("Live detection active")
+            return
+        current_time = time.time()
+        messages = []
+        for best_id, best_distance in matches:
+            if best_distance >= self.match_threshold:
+                messages.append(f"👤 Face detected - Best match: {best_id}, Distance: {best_distance:.3f} (not recognized)")
+                continue
+            emp_id = best_id
+            if self.recognition_throttle.in_cooldown(emp_id, current_time):
+                continue
+            name = self.employees.get(emp_id, "Unknown")
+            if self.is_attendance_already_marked(emp_id):
+                messages.append(f"⚠️ {emp_id} ({name}) - Already marked today! (Distance: {best_distance:.3f})")
+                self.recognition_throttle.touch(emp_id, current_time)
+                continue
+            if self.recognition_throttle.limit_reached(emp_id):
+                messages.append(f"⚠️ {emp_id} already recognized {self.max_recognition_per_person} times (Distance: {best_distance:.3f})")
+                continue
+            success = self.save_recognition(emp_id, name)
+            if success:
+                self.last_recognized_id = emp_id
+                self.recognition_throttle.touch(emp_id, current_time, counted=True)
+                messages.append(f"✅ ATTENDANCE MARKED: {emp_id} ({name}) - {datetime.now().strftime('%H:%M')} (Distance: {best_distance:.3f})")
+            else:
+                messages.append(f"❌ Failed to mark attendance for {emp_id} (Distance: {best_distance:.3f})")
+        if messages:
+            self.status_label.setText(" | ".join(messages))
+
     def is_attendance_already_marked(self, emp_id):
         """Check if attendance is already marked for this employee today"""
         try:
-            # Check if JSON file exists and has entries for today
-            if os.path.exists(self.json_file) and os.path.getsize(self.json_file) > 0:
-                with open(self.json_file, 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        today = datetime.now().strftime('%Y-%m-%d')
-                        for entry in data:
-                            if entry.get('employee_id') == emp_id:
-                                entry_timestamp = entry.get('timestamp', '')
-                                if entry_timestamp:
-                                    try:
-                                        entry_date = datetime.fromisoformat(entry_timestamp).strftime('%Y-%m-%d')
-                                        if entry_date == today:
-                                            return True
-                                    except:
-                                        pass
-            return False
+            # Set lookup; reloaded when the store changes and updated by save_recognition
+            return self.presence.contains(emp_id)
         except Exception as e:
             return False
 
@@ -300,18 +435,12 @@ class SimpleFaceApp(QWidget):
                 "status": "recognized",
                 "unique_id": unique_id
             }
-            existing = []
-            if os.path.exists(self.json_file) and os.path.getsize(self.json_file) > 0:
-                try:
-                    with open(self.json_file, 'r') as f:
-                        existing = json.load(f)
-                        if not isinstance(existing, list):
-                            existing = [existing]
-                except:
-                    existing = []
-            existing.append(data)
-            with open(self.json_file, 'w') as f:
-                json.dump(existing, f, indent=2)
+            # One appended line per event; nothing already logged is re-read or rewritten
+            self.event_log.append(data)
+            self.presence.add(emp_id)
+            if self.event_publisher is not None:
+                # Best effort: when the dashboard is not listening it picks the event up from the log
+                self.event_publisher.publish(data)
             return True
         except Exception as e:
             return False
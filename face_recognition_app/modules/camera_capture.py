@@ -0,0 +1,96 @@
+import collections
+import threading
+import time
+
+import cv2
+
+
+class CameraCapture:
+    """
+    Reads the camera in a dedicated thread and keeps only the newest frames.
+
+    OpenCV's own buffer hands back stale frames when the reader falls behind,
+    so this thread drains the device continuously and publishes decoded frames
+    into a small ring buffer (one slot by default). Consumers call ``latest()``
+    and get the most recent frame by reference - no copy is made, so they must
+    treat it as read-only. ``min_interval`` throttles the capture rate itself:
+    the thread sleeps between frames instead of grabbing and decoding at the
+    device's full FPS. The app raises it while the scene is idle.
+    """
+
+    def __init__(self, source=0, width=None, height=None, fps=None, fourcc="MJPG", buffer_size=1):
+        self.source = source
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.frames = collections.deque(maxlen=max(1, buffer_size))
+        self.sequence = 0
+        self.min_interval = 0.0
+        self.capture = None
+        self.thread = None
+        self.running = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Open the device and start the capture thread; returns False if it cannot be opened."""
+        self.capture = cv2.VideoCapture(self.source)
+        if not self.capture.isOpened():
+            self.capture.release()
+            self.capture = None
+            return False
+        # FOURCC first: some drivers only honour the resolution for the chosen pixel format
+        if self.fourcc:
+            self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            self.capture.set(cv2.CAP_PROP_FPS, self.fps)
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.running.set()
+        self.thread = threading.Thread(target=self._run, name="camera-capture", daemon=True)
+        self.thread.start()
+        return True
+
+    def _run(self):
+        last_decode = 0.0
+        while self.running.is_set():
+            # Short sleeps, so a lowered interval (motion started) applies within 50 ms
+            remaining = last_decode + self.min_interval - time.time()
+            if remaining > 0:
+                time.sleep(min(remaining, 0.05))
+                continue
+            if not self.capture.grab():
+                time.sleep(0.01)
+                continue
+            now = time.time()
+            ret, frame = self.capture.retrieve()
+            if not ret or frame is None:
+                continue
+            last_decode = now
+            with self._lock:
+                self.sequence += 1
+                self.frames.append((self.sequence, frame))
+
+    def latest(self):
+        """Return (sequence, frame) for the newest frame, or (0, None) before the first one."""
+        with self._lock:
+            if not self.frames:
+                return 0, None
+            return self.frames[-1]
+
+    def set_min_interval(self, seconds):
+        self.min_interval = seconds
+
+    def release(self):
+        self.running.clear()
+        if self.thread is not None:
+            self.thread.join(1.0)
+            self.thread = None
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+        with self._lock:
+            self.frames.clear()
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+ENCODING_DIM = 128
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg')
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    """Return the SHA-1 hex digest of a file, read in chunks."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def emp_id_from_filename(fname):
+    """MSN001.jpg -> MSN001"""
+    return os.path.splitext(fname)[0].strip().upper()
+
+
+def list_face_images(known_dir):
+    """Return sorted image file names in the known_face folder."""
+    if not os.path.isdir(known_dir):
+        return []
+    return sorted(f for f in os.listdir(known_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+
+
+class EncodingCache:
+    """
+    Persistent face encoding store for the known_face gallery.
+
+    Encodings are kept in a compact float32 (N x 128) ``.npy`` file and an
+    index ``.json`` that maps each image file to its size, mtime, SHA-1 and
+    the row holding its encoding (-1 when the image contained no face).
+    An image is re-encoded only when it is new or its size/mtime changed
+    and its content hash no longer matches.
+    """
+
+    def __init__(self, cache_dir, name="face_encodings"):
+        self.cache_dir = cache_dir
+        self.matrix_path = os.path.join(cache_dir, f"{name}.npy")
+        self.index_path = os.path.join(cache_dir, f"{name}_index.json")
+        self.entries = {}  # fname -> {size, mtime, sha1, emp_id, encoding}
+        self.dirty = False
+
+    def load(self):
+        """Load the store from disk; a missing or corrupt store starts empty."""
+        self.entries = {}
+        try:
+            if not (os.path.exists(self.index_path) and os.path.exists(self.matrix_path)):
+                return
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            matrix = np.load(self.matrix_path)
+            for fname, meta in index.get('files', {}).items():
+                row = meta.get('row', -1)
+                encoding = matrix[row] if 0 <= row < len(matrix) else None
+                self.entries[fname] = {
+                    'size': meta['size'],
+                    'mtime': meta['mtime'],
+                    'sha1': meta['sha1'],
+                    'emp_id': meta['emp_id'],
+                    'encoding': encoding,
+                }
+        except Exception as e:
+            print(f"⚠️ Encoding cache unreadable, rebuilding: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write the matrix and index atomically (tmp file + os.replace)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        rows = []
+        files = {}
+        for fname, entry in sorted(self.entries.items()):
+            row = -1
+            if entry['encoding'] is not None:
+                row = len(rows)
+                rows.append(entry['encoding'])
+            files[fname] = {
+                'size': entry['size'],
+                'mtime': entry['mtime'],
+                'sha1': entry['sha1'],
+                'emp_id': entry['emp_id'],
+                'row': row,
+            }
+        if rows:
+            matrix = np.ascontiguousarray(np.vstack(rows), dtype=np.float32)
+        else:
+            matrix = np.zeros((0, ENCODING_DIM), dtype=np.float32)
+
+        tmp_matrix = self.matrix_path + '.tmp'
+        with open(tmp_matrix, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_matrix, self.matrix_path)
+
+        tmp_index = self.index_path + '.tmp'
+        with open(tmp_index, 'w') as f:
+            json.dump({'dim': ENCODING_DIM, 'files': files}, f)
+        os.replace(tmp_index, self.index_path)
+        self.dirty = False
+
+    def lookup(self, known_dir, fname):
+        """
+        Return the cache entry for an image if it is still valid, else None.
+        Size + mtime match is trusted; otherwise the content hash decides.
+        """
+        entry = self.entries.get(fname)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(os.path.join(known_dir, fname))
+        except OSError:
+            return None
+        if entry['size'] == st.st_size and entry['mtime'] == st.st_mtime:
+            return entry
+        if entry['size'] == st.st_size and entry['sha1'] == file_sha1(os.path.join(known_dir, fname)):
+            # Touched but unchanged - refresh the stored mtime
+            entry['mtime'] = st.st_mtime
+            self.dirty = True
+            return entry
+        return None
+
+    def update(self, known_dir, fname, encode_fn):
+        """Encode one image with ``encode_fn(path)`` and store the result."""
+        path = os.path.join(known_dir, fname)
+        st = os.stat(path)
+        encoding = encode_fn(path)
+        if encoding is not None:
+            encoding = np.asarray(encoding, dtype=np.float32)
+        entry = {
+            'size': st.st_size,
+            'mtime': st.st_mtime,
+            'sha1': file_sha1(path),
+            'emp_id': emp_id_from_filename(fname),
+            'encoding': encoding,
+        }
+        self.entries[fname] = entry
+        self.dirty = True
+        return entry
+
+    def forget(self, fname):
+        if self.entries.pop(fname, None) is not None:
+            self.dirty = True
+
+    def sync(self, known_dir, encode_fn):
+        """
+        Bring the store in line with the known_face folder and return
+        (encodings, ids) for every image that contains a face.
+        Only new or changed images are passed to ``encode_fn``.
+        """
+        current = list_face_images(known_dir)
+        for fname in set(self.entries) - set(current):
+            self.forget(fname)
+
+        faces, ids = [], []
+        encoded = 0
+        for fname in current:
+            entry = self.lookup(known_dir, fname)
+            if entry is None:
+                try:
+                    entry = self.update(known_dir, fname, encode_fn)
+                    encoded += 1
+                except Exception as e:
+                    print(f"❌ Error encoding {fname}: {e}")
+                    continue
+            if entry['encoding'] is not None:
+                faces.append(entry['encoding'])
+                ids.append(entry['emp_id'])
+
+        if self.dirty:
+            try:
+                self.save()
+            except Exception as e:
+                print(f"⚠️ Could not save encoding cache: {e}")
+        if encoded:
+            print(f"✅ Encoded {encoded} new/changed face image(s), {len(ids)} in gallery")
+        return faces, ids
+
+
+def scan_face_images(known_dir):
+    """Return {fname: (size, mtime)} for the known_face folder (stat only, no reads)."""
+    snapshot = {}
+    for fname in list_face_images(known_dir):
+        try:
+            st = os.stat(os.path.join(known_dir, fname))
+        except OSError:
+            continue
+        snapshot[fname] = (st.st_size, st.st_mtime)
+    return snapshot
+
+
+def diff_snapshots(old, new):
+    """Return (added, modified, removed) file name sets between two scans."""
+    added = set(new) - set(old)
+    removed = set(old) - set(new)
+    modified = set(f for f in set(new) & set(old) if new[f] != old[f])
+    return added, modified, removed
@@ -0,0 +1,185 @@
+import json
+import os
+import secrets
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+# Optional push channel for recognition events, face app -> dashboard.
+# The file event log stays the source of truth; a pushed event only tells the
+# dashboard to ingest now instead of waiting for its next poll.
+# Events travel as JSON bytes (never pickles), and both ends authenticate with
+# a random per-install key kept in the shared folder.
+PIPE_NAME = r"\\.\pipe\msn_attendance_events"
+SOCKET_NAME = "recognition_events.sock"
+AUTHKEY_FILE = "recognition_events.key"
+MAX_EVENT_BYTES = 64 * 1024
+
+
+def default_address(shared_dir):
+    """Named pipe on Windows, Unix domain socket in the shared folder elsewhere."""
+    if os.name == 'nt':
+        return PIPE_NAME
+    return os.path.join(shared_dir, SOCKET_NAME)
+
+
+def load_authkey(shared_dir):
+    """
+    The channel's authentication key, generated on first use and stored in
+    ``shared_dir`` readable by the owner only (mode 0600).
+    """
+    path = os.path.join(shared_dir, AUTHKEY_FILE)
+    for _ in range(50):
+        try:
+            with open(path, 'r') as f:
+                key = f.read().strip()
+            if key:
+                return key.encode('ascii')
+        except FileNotFoundError:
+            os.makedirs(shared_dir, exist_ok=True)
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                continue
+            key = secrets.token_hex(32)
+            with os.fdopen(fd, 'w') as f:
+                f.write(key)
+            return key.encode('ascii')
+        # Created by the other process but not written yet
+        time.sleep(0.02)
+    raise RuntimeError(f"Recognition channel key {path} is empty")
+
+
+def encode_event(event):
+    return json.dumps(event, separators=(',', ':')).encode('utf-8')
+
+
+def decode_event(data):
+    """Parse a pushed event; returns None for anything that is not a JSON object."""
+    try:
+        event = json.loads(data.decode('utf-8'))
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+class EventPublisher:
+    """
+    Sends events to the dashboard listener, reconnecting lazily.
+    After a failure it stays quiet for ``retry_seconds`` so a stopped
+    dashboard never slows down the camera loop.
+    """
+
+    def __init__(self, address, authkey, retry_seconds=5.0):
+        self.address = address
+        self.authkey = authkey
+        self.retry_seconds = retry_seconds
+        self.conn = None
+        self.next_attempt = 0.0
+
+    def publish(self, event):
+        """Push one event; returns False if the channel is down (the file log still has it)."""
+        now = time.time()
+        if self.conn is None:
+            if now < self.next_attempt:
+                return False
+            try:
+                self.conn = Client(self.address, authkey=self.authkey)
+            except Exception:
+                self.next_attempt = now + self.retry_seconds
+                return False
+        try:
+            self.conn.send_bytes(encode_event(event))
+            return True
+        except Exception:
+            self.close()
+            self.next_attempt = now + self.retry_seconds
+            return False
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+
+class EventListener:
+    """
+    Accepts publisher connections in a background thread and calls
+    ``on_event(event)`` for every event received, from a per-connection thread.
+    """
+
+    def __init__(self, address, on_event, authkey):
+        self.address = address
+        self.on_event = on_event
+        self.authkey = authkey
+        self.listener = None
+        self.thread = None
+        self.connections = 0
+        self.received = 0
+
+    def start(self):
+        """Bind and start accepting; returns False if the address cannot be bound."""
+        try:
+            if os.name != 'nt' and os.path.exists(self.address):
+                if self._address_in_use():
+                    print("ℹ️ Recognition push channel already served by another dashboard process")
+                    return False
+                # Stale socket left by a previous dashboard process
+                os.remove(self.address)
+            self.listener = Listener(self.address, authkey=self.authkey)
+        except Exception as e:
+            print(f"⚠️ Recognition push channel unavailable, using file polling only: {e}")
+            self.listener = None
+            return False
+        self.thread = threading.Thread(target=self._accept_loop, name="recognition-listener", daemon=True)
+        self.thread.start()
+        return True
+
+    def _address_in_use(self):
+        try:
+            Client(self.address, authkey=self.authkey).close()
+            return True
+        except Exception:
+            return False
+
+    @property
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def _accept_loop(self):
+        while self.listener is not None:
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                if self.listener is None:
+                    break
+                print(f"⚠️ Recognition push channel accept failed: {e}")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), name="recognition-conn", daemon=True).start()
+
+    def _serve(self, conn):
+        self.connections += 1
+        try:
+            while True:
+                event = decode_event(conn.recv_bytes(MAX_EVENT_BYTES))
+                if event is None:
+                    print("⚠️ Ignoring malformed pushed event")
+                    continue
+                self.received += 1
+                try:
+                    self.on_event(event)
+                except Exception as e:
+                    print(f"❌ Error ingesting pushed event: {e}")
+        except (EOFError, OSError):
+            pass
+        finally:
+            self.connections -= 1
+            conn.close()
+
+    def close(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.close()
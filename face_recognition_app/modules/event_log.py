@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+# Recognition events shared between the face app (producer) and the dashboard (consumer).
+# One newline-delimited JSON record per event, one segment file per day:
+#   shared/recognition_events/events_2026-10-18.jsonl
+EVENT_LOG_DIRNAME = "recognition_events"
+SEGMENT_PREFIX = "events_"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def segment_name(day=None):
+    day = day or datetime.now()
+    return f"{SEGMENT_PREFIX}{day.strftime('%Y-%m-%d')}{SEGMENT_SUFFIX}"
+
+
+def list_segments(log_dir):
+    """Return segment file names, oldest first (names sort by date)."""
+    if not os.path.isdir(log_dir):
+        return []
+    return sorted(f for f in os.listdir(log_dir) if f.startswith(SEGMENT_PREFIX) and f.endswith(SEGMENT_SUFFIX))
+
+
+class EventLogWriter:
+    """
+    Append-only recognition event log.
+
+    Each event is serialised to one line and written with a single
+    ``os.write`` on an ``O_APPEND`` descriptor, so concurrent readers only
+    ever see whole records (or an unfinished last line they can skip) and the
+    cost per event does not grow with the size of the day's log.
+    """
+
+    def __init__(self, log_dir):
+        self.log_dir = log_dir
+        os.makedirs(log_dir, exist_ok=True)
+
+    def segment_path(self, day=None):
+        return os.path.join(self.log_dir, segment_name(day))
+
+    def append(self, event):
+        line = (json.dumps(event, separators=(',', ':')) + "\n").encode('utf-8')
+        # Opened per event so daily rotation and a removed segment never strand the writer
+        fd = os.open(self.segment_path(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+def read_segment_records(path, offset=0):
+    """
+    Like ``read_segment``, but returns ([(event, end_offset), ...], next_offset)
+    where ``end_offset`` is the byte offset just past that event's line.
+    """
+    records = []
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return records, offset
+    end = data.rfind(b"\n")
+    if end < 0:
+        return records, offset
+    line_start = 0
+    while line_start <= end:
+        line_end = data.index(b"\n", line_start)
+        line = data[line_start:line_end]
+        line_start = line_end + 1
+        if not line.strip():
+            continue
+        try:
+            records.append((json.loads(line), offset + line_start))
+        except ValueError:
+            print(f"⚠️ Skipping corrupt event line in {os.path.basename(path)}")
+    return records, offset + end + 1
+
+
+def read_segment(path, offset=0):
+    """
+    Read complete records from ``path`` starting at byte ``offset``.
+    Returns (events, next_offset); a trailing line without a newline is
+    left for the next read. Corrupt lines are skipped.
+    """
+    records, next_offset = read_segment_records(path, offset)
+    return [event for event, _ in records], next_offset
+
+
+def read_all_events(log_dir):
+    """Read every event from every segment, oldest first."""
+    events = []
+    for name in list_segments(log_dir):
+        segment_events, _ = read_segment(os.path.join(log_dir, name))
+        events.extend(segment_events)
+    return events
+
+
+def read_latest_event(log_dir):
+    """Return the most recent event in the newest segment, or None."""
+    segments = list_segments(log_dir)
+    if not segments:
+        return None
+    events, _ = read_segment(os.path.join(log_dir, segments[-1]))
+    return events[-1] if events else None
+
+
+class EventLogReader:
+    """
+    Incremental consumer of the event log with a durable checkpoint.
+
+    The checkpoint (segment name + byte offset, plus the ``unique_id`` values
+    already consumed from that segment) is stored as JSON next to the log.
+    ``poll`` returns only events appended since the last ``commit``, skipping
+    any ``unique_id`` already consumed. Nothing is deleted, so events the
+    producer appends while the consumer works are never lost, and a restart
+    resumes from the last committed position.
+    Callers that share one reader across threads should hold ``lock`` around
+    poll + processing + commit.
+    """
+
+    def __init__(self, log_dir, consumer="dashboard"):
+        self.log_dir = log_dir
+        self.checkpoint_path = os.path.join(log_dir, f"{consumer}.checkpoint.json")
+        self.lock = threading.RLock()
+        self.segment = None
+        self.offset = 0
+        self.seen_ids = set()
+        self._pending = None
+        self._positions = []
+        self.load_checkpoint()
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+            self.segment = checkpoint.get('segment')
+            self.offset = int(checkpoint.get('offset', 0))
+            self.seen_ids = set(checkpoint.get('seen_ids', []))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Event log checkpoint unreadable, starting from the beginning: {e}")
+            self.segment, self.offset, self.seen_ids = None, 0, set()
+
+    def _segments_to_read(self):
+        return [name for name in list_segments(self.log_dir) if self.segment is None or name >= self.segment]
+
+    def pending_bytes(self):
+        """Cheap stat-only check of how many bytes were appended since the checkpoint."""
+        total = 0
+        for name in self._segments_to_read():
+            try:
+                size = os.path.getsize(os.path.join(self.log_dir, name))
+            except OSError:
+                continue
+            total += size - self.offset if name == self.segment else size
+        return max(total, 0)
+
+    def poll(self):
+        """Return new, not yet consumed events; call ``commit`` once they are handled."""
+        segment, offset, seen_ids = self.segment, self.offset, set(self.seen_ids)
+        events = []
+        positions = []
+        for name in self._segments_to_read():
+            if name != segment:
+                # Moving to a newer day: earlier unique_ids can no longer reappear
+                segment, offset, seen_ids = name, 0, set()
+            records, offset = read_segment_records(os.path.join(self.log_dir, name), offset)
+            for event, end_offset in records:
+                unique_id = event.get('unique_id')
+                if unique_id and unique_id in seen_ids:
+                    continue
+                if unique_id:
+                    seen_ids.add(unique_id)
+                events.append(event)
+                positions.append((name, end_offset, unique_id))
+        self._pending = (segment, offset, seen_ids)
+        self._positions = positions
+        return events
+
+    def commit(self, count=None):
+        """
+        Persist the position reached by the last ``poll`` (atomic tmp + replace).
+        With ``count`` only the first ``count`` polled events are consumed; the
+        rest are returned again by the next ``poll``.
+        """
+        if self._pending is None:
+            return
+        if count is not None and count < len(self._positions):
+            if count <= 0:
+                self._pending = None
+                return
+            segment, seen_ids = self.segment, set(self.seen_ids)
+            for name, end_offset, unique_id in self._positions[:count]:
+                if name != segment:
+                    segment, seen_ids = name, set()
+                if unique_id:
+                    seen_ids.add(unique_id)
+                offset = end_offset
+            self._pending = (segment, offset, seen_ids)
+        self.segment, self.offset, self.seen_ids = self._pending
+        self._pending = None
+        os.makedirs(self.log_dir, exist_ok=True)
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'segment': self.segment, 'offset': self.offset, 'seen_ids': sorted(self.seen_ids)}, f)
+        os.replace(tmp_path, self.checkpoint_path)
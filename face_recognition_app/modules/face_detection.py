@@ -0,0 +1,51 @@
+import cv2
+import face_recognition
+
+# dlib's HOG detector scans an 80x80 window; each upsample halves the smallest face it can find
+HOG_WINDOW_PX = 80
+MIN_DETECTION_SCALE = 0.25
+MAX_DETECTION_SCALE = 1.0
+# Smallest face height (full-res pixels) at the kiosk distance, unless configured
+DEFAULT_MIN_FACE_PX = 120
+
+
+def auto_detection_scale(min_face_px, upsample=1, margin=1.25):
+    """
+    Pick the smallest frame scale at which a face of ``min_face_px`` pixels
+    (full-resolution height at the kiosk distance) is still detectable.
+    ``margin`` keeps faces comfortably above the detector's lower limit.
+    """
+    smallest_detectable = HOG_WINDOW_PX / (2 ** upsample)
+    scale = smallest_detectable * margin / max(float(min_face_px), 1.0)
+    return min(MAX_DETECTION_SCALE, max(MIN_DETECTION_SCALE, scale))
+
+
+def resolve_detection_scale(config):
+    """Return the configured detection scale, computing it when set to "auto"."""
+    scale = config.get("detection_scale", 1.0)
+    upsample = config.get("detection_upsample", 1)
+    if scale == "auto":
+        return auto_detection_scale(config.get("min_face_px", DEFAULT_MIN_FACE_PX), upsample)
+    return min(MAX_DETECTION_SCALE, max(MIN_DETECTION_SCALE, float(scale)))
+
+
+def detect_faces_scaled(rgb_frame, scale=1.0, upsample=1):
+    """
+    Run HOG detection on a downscaled copy of ``rgb_frame`` and return face
+    boxes (top, right, bottom, left) in full-resolution coordinates, so
+    encodings can still be computed from full-detail crops.
+    """
+    if scale >= 1.0:
+        return face_recognition.face_locations(rgb_frame, number_of_times_to_upsample=upsample)
+    height, width = rgb_frame.shape[:2]
+    small = cv2.resize(rgb_frame, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    boxes = face_recognition.face_locations(small, number_of_times_to_upsample=upsample)
+    locations = []
+    for top, right, bottom, left in boxes:
+        locations.append((
+            max(0, int(round(top / scale))),
+            min(width, int(round(right / scale))),
+            min(height, int(round(bottom / scale))),
+            max(0, int(round(left / scale))),
+        ))
+    return locations
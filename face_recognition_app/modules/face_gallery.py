@@ -0,0 +1,106 @@
+import numpy as np
+
+ENCODING_DIM = 128
+
+
+class FaceGallery:
+    """
+    Known face encodings held as one contiguous float32 (N x 128) matrix
+    with cached squared norms.
+
+    All faces detected in a frame are scored with a single matrix multiply:
+        ||q - g||^2 = ||q||^2 + ||g||^2 - 2 q.g
+    which gives the same euclidean distance as face_recognition.face_distance.
+    Rows are preallocated and grown by doubling so ``add`` is amortised O(1).
+    """
+
+    def __init__(self, capacity=0, dim=ENCODING_DIM):
+        self.dim = dim
+        self._matrix = np.zeros((max(capacity, 1), dim), dtype=np.float32)
+        self._sq_norms = np.zeros(max(capacity, 1), dtype=np.float32)
+        self.ids = []
+        self.size = 0
+
+    @classmethod
+    def from_encodings(cls, encodings, ids):
+        """Build a gallery from a list of encodings and matching employee IDs."""
+        gallery = cls(capacity=len(ids))
+        if len(ids):
+            matrix = np.asarray(np.vstack(encodings), dtype=np.float32)
+            gallery._matrix[:len(ids)] = matrix
+            gallery._sq_norms[:len(ids)] = np.einsum('ij,ij->i', matrix, matrix)
+            gallery.ids = list(ids)
+            gallery.size = len(ids)
+        return gallery
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def matrix(self):
+        """Read-only view of the filled rows."""
+        return self._matrix[:self.size]
+
+    def add(self, encoding, emp_id):
+        if self.size == len(self._matrix):
+            self._grow(max(2 * len(self._matrix), 16))
+        row = np.asarray(encoding, dtype=np.float32)
+        self._matrix[self.size] = row
+        self._sq_norms[self.size] = row @ row
+        self.ids.append(emp_id)
+        self.size += 1
+
+    def _grow(self, capacity):
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        sq_norms = np.zeros(capacity, dtype=np.float32)
+        matrix[:self.size] = self._matrix[:self.size]
+        sq_norms[:self.size] = self._sq_norms[:self.size]
+        self._matrix, self._sq_norms = matrix, sq_norms
+
+    def _scores(self, queries):
+        """
+        Return (queries, scores) where scores = ||g||^2 - 2 q.g, shape (M x N).
+        Ranking by score equals ranking by distance since ||q||^2 is constant per row.
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        # (N x 128) @ (128 x M) streams the gallery once for all M faces
+        scores = (self._matrix[:self.size] @ queries.T).T
+        scores *= -2.0
+        scores += self._sq_norms[:self.size]
+        return queries, scores
+
+    def distances(self, queries):
+        """Return an (M x N) matrix of euclidean distances for M query encodings."""
+        if self.size == 0:
+            return np.zeros((len(np.atleast_2d(queries)), 0), dtype=np.float32)
+        queries, d2 = self._scores(queries)
+        d2 += np.einsum('ij,ij->i', queries, queries)[:, None]
+        np.maximum(d2, 0.0, out=d2)
+        return np.sqrt(d2, out=d2)
+
+    def top_k(self, queries, k=1):
+        """
+        Return, for each query, a list of up to ``k`` (emp_id, distance)
+        pairs sorted by increasing distance.
+        """
+        if self.size == 0:
+            return [[] for _ in range(len(np.atleast_2d(queries)))]
+        queries, scores = self._scores(queries)
+        k = min(k, self.size)
+        if k == 1:
+            idx = scores.argmin(axis=1)[:, None]
+        elif k < self.size:
+            idx = np.argpartition(scores, k - 1, axis=1)[:, :k]
+        else:
+            idx = np.tile(np.arange(self.size), (len(scores), 1))
+        part = np.take_along_axis(scores, idx, axis=1)
+        order = np.argsort(part, axis=1)
+        idx = np.take_along_axis(idx, order, axis=1)
+        # Only the k selected scores are turned into distances
+        q_sq = np.einsum('ij,ij->i', queries, queries)[:, None]
+        dist = np.sqrt(np.maximum(np.take_along_axis(part, order, axis=1) + q_sq, 0.0))
+        return [[(self.ids[j], float(d)) for j, d in zip(row_idx, row_d)] for row_idx, row_d in zip(idx, dist)]
+
+    def best_matches(self, queries):
+        """Return the single closest (emp_id, distance) for each query, or None when empty."""
+        return [matches[0] if matches else None for matches in self.top_k(queries, k=1)]
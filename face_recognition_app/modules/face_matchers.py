@@ -0,0 +1,196 @@
+import sys
+import time
+
+import numpy as np
+
+from modules.face_gallery import FaceGallery, ENCODING_DIM
+
+# Matchers share one interface:
+#   len(matcher), matcher.top_k(queries, k) -> [[(emp_id, distance), ...], ...]
+#   matcher.best_matches(queries) -> [(emp_id, distance) or None, ...]
+
+
+class ExactMatcher(FaceGallery):
+    """Brute-force matcher: every query is scored against every gallery row."""
+    backend = "exact"
+
+
+class IVFMatcher:
+    """
+    Approximate matcher using an inverted file (IVF) index.
+
+    The gallery is partitioned with k-means into ``n_lists`` cells; rows are
+    stored grouped by cell in one contiguous float32 matrix. A query is only
+    scored against the ``n_probe`` cells whose centroids are closest, so
+    ``n_probe`` is the recall/latency knob (n_probe == n_lists is exact).
+    """
+    backend = "ivf"
+
+    def __init__(self, n_lists=None, n_probe=8, kmeans_iters=15, seed=0, dim=ENCODING_DIM):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.kmeans_iters = kmeans_iters
+        self.seed = seed
+        self.ids = []
+        self.size = 0
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+        self._centroids = np.zeros((0, dim), dtype=np.float32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+
+    @classmethod
+    def from_encodings(cls, encodings, ids, **options):
+        matcher = cls(**options)
+        matcher.build(encodings, ids)
+        return matcher
+
+    def __len__(self):
+        return self.size
+
+    def build(self, encodings, ids):
+        if not len(ids):
+            return
+        data = np.ascontiguousarray(np.vstack(encodings), dtype=np.float32)
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(data))))
+        n_lists = min(n_lists, len(data))
+        self._centroids = self._kmeans(data, n_lists)
+        assign = self._nearest_centroid(data)
+
+        # Store rows grouped by cell so each cell is a contiguous slice
+        order = np.argsort(assign, kind='stable')
+        self._matrix = np.ascontiguousarray(data[order])
+        self._sq_norms = np.einsum('ij,ij->i', self._matrix, self._matrix)
+        counts = np.bincount(assign, minlength=n_lists)
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.ids = [ids[i] for i in order]
+        self.size = len(ids)
+        self.n_lists = n_lists
+
+    def _kmeans(self, data, n_lists):
+        rng = np.random.default_rng(self.seed)
+        # Train on a sample; 64 points per cell is plenty for 128-d face encodings
+        sample_size = min(len(data), 64 * n_lists)
+        sample = data[rng.choice(len(data), sample_size, replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.kmeans_iters):
+            self._centroids = centroids
+            assign = self._nearest_centroid(sample)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=n_lists)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+        return centroids
+
+    def _nearest_centroid(self, data, chunk=8192):
+        c_sq = np.einsum('ij,ij->i', self._centroids, self._centroids)
+        assign = np.empty(len(data), dtype=np.int64)
+        for start in range(0, len(data), chunk):
+            block = data[start:start + chunk]
+            assign[start:start + chunk] = (c_sq[None, :] - 2.0 * (block @ self._centroids.T)).argmin(axis=1)
+        return assign
+
+    def top_k(self, queries, k=1):
+        queries = np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if self.size == 0:
+            return [[] for _ in range(len(queries))]
+        n_probe = min(self.n_probe, self.n_lists)
+        c_sq = np.einsum('ij,ij->i', self._centroids, self._centroids)
+        cell_scores = c_sq[None, :] - 2.0 * (queries @ self._centroids.T)
+        probes = np.argpartition(cell_scores, n_probe - 1, axis=1)[:, :n_probe]
+
+        results = []
+        for query, cells in zip(queries, probes):
+            rows, scores = [], []
+            for cell in cells:
+                start, end = self._offsets[cell], self._offsets[cell + 1]
+                if start == end:
+                    continue
+                scores.append(self._sq_norms[start:end] - 2.0 * (self._matrix[start:end] @ query))
+                rows.append(np.arange(start, end))
+            if not rows:
+                results.append([])
+                continue
+            rows = np.concatenate(rows)
+            scores = np.concatenate(scores)
+            kk = min(k, len(rows))
+            best = np.argpartition(scores, kk - 1)[:kk] if kk < len(rows) else np.arange(len(rows))
+            best = best[np.argsort(scores[best])]
+            dist = np.sqrt(np.maximum(scores[best] + query @ query, 0.0))
+            results.append([(self.ids[rows[i]], float(d)) for i, d in zip(best, dist)])
+        return results
+
+    def best_matches(self, queries):
+        return [matches[0] if matches else None for matches in self.top_k(queries, k=1)]
+
+
+MATCHER_BACKENDS = {
+    ExactMatcher.backend: ExactMatcher,
+    IVFMatcher.backend: IVFMatcher,
+}
+
+
+def make_matcher(backend, encodings, ids, **options):
+    """Build a matcher for the configured backend name ('exact' or 'ivf')."""
+    if backend not in MATCHER_BACKENDS:
+        raise ValueError(f"Unknown matcher backend: {backend}")
+    if backend == ExactMatcher.backend:
+        return ExactMatcher.from_encodings(encodings, ids)
+    return MATCHER_BACKENDS[backend].from_encodings(encodings, ids, **options)
+
+
+def recall_report(approx, exact, queries, k=1, repeats=3):
+    """
+    Compare an approximate matcher with the exact one on the same queries.
+    Returns recall@k (fraction of exact top-k IDs found) and per-query latency.
+    """
+    def timed(matcher):
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = matcher.top_k(queries, k)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best / max(len(queries), 1) * 1000
+
+    approx_result, approx_ms = timed(approx)
+    exact_result, exact_ms = timed(exact)
+    hits = total = 0
+    for a, e in zip(approx_result, exact_result):
+        expected = set(emp_id for emp_id, _ in e)
+        hits += len(expected & set(emp_id for emp_id, _ in a))
+        total += len(expected)
+    return {
+        'backend': approx.backend,
+        'gallery_size': len(exact),
+        'queries': len(queries),
+        'k': k,
+        f'recall@{k}': hits / total if total else 1.0,
+        'approx_ms_per_query': approx_ms,
+        'exact_ms_per_query': exact_ms,
+        'speedup': exact_ms / approx_ms if approx_ms else float('inf'),
+    }
+
+
+if __name__ == "__main__":
+    # Usage: python -m modules.face_matchers [gallery_size] [n_probe ...]
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    probes = [int(p) for p in sys.argv[2:]] or [1, 4, 8, 16, 32]
+    rng = np.random.default_rng(42)
+    # Synthetic clustered encodings roughly shaped like dlib face embeddings
+    centres = rng.normal(0, 0.1, (max(1, size // 50), ENCODING_DIM)).astype(np.float32)
+    gallery = centres[rng.integers(0, len(centres), size)] + rng.normal(0, 0.05, (size, ENCODING_DIM)).astype(np.float32)
+    ids = [f"EMP{i:06d}" for i in range(size)]
+    queries = gallery[rng.choice(size, 200, replace=False)] + rng.normal(0, 0.02, (200, ENCODING_DIM)).astype(np.float32)
+
+    exact = ExactMatcher.from_encodings(gallery, ids)
+    start = time.perf_counter()
+    ivf = IVFMatcher.from_encodings(gallery, ids)
+    print(f"🔧 IVF build: {ivf.n_lists} lists over {size} encodings in {time.perf_counter() - start:.2f}s")
+    for n_probe in probes:
+        ivf.n_probe = n_probe
+        report = recall_report(ivf, exact, queries, k=1)
+        print(f"n_probe={n_probe:3d}  recall@1={report['recall@1']:.3f}  "
+              f"ivf={report['approx_ms_per_query']:.3f} ms  exact={report['exact_ms_per_query']:.3f} ms  "
+              f"speedup={report['speedup']:.1f}x")
@@ -0,0 +1,132 @@
+import itertools
+import threading
+
+
+def box_iou(a, b):
+    """IOU of two (top, right, bottom, left) boxes."""
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    left, right = max(a[3], b[3]), min(a[1], b[1])
+    if bottom <= top or right <= left:
+        return 0.0
+    inter = (bottom - top) * (right - left)
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    return inter / float(area_a + area_b - inter)
+
+
+def centroid_shift(a, b):
+    """Distance between box centres, relative to the size of box ``a``."""
+    ay, ax = (a[0] + a[2]) / 2.0, (a[1] + a[3]) / 2.0
+    by, bx = (b[0] + b[2]) / 2.0, (b[1] + b[3]) / 2.0
+    size = max(a[2] - a[0], a[1] - a[3], 1)
+    return ((ay - by) ** 2 + (ax - bx) ** 2) ** 0.5 / size
+
+
+class Track:
+    def __init__(self, track_id, box, now):
+        self.track_id = track_id
+        self.box = box
+        self.first_seen = now
+        self.last_seen = now
+        self.missed = 0
+        self.emp_id = None
+        self.distance = None
+        self.last_encoded = None
+        self.recognized = False
+
+
+class FaceTracker:
+    """
+    Lightweight IOU/centroid tracker for detected face boxes.
+
+    Each detection is linked to an existing track (greedy, highest IOU first,
+    falling back to a small centroid shift for fast movement) or starts a new
+    one. A face only needs a fresh 128-d encoding when its track is new, was
+    not recognized yet (retried every ``retry_seconds``), or a recognized
+    identity is due for re-verification after ``reverify_seconds``. Other
+    frames carry the track's identity forward.
+    Thread-safe: the encode and match pipeline stages both use it.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_centroid_shift=0.5, max_missed=5,
+                 reverify_seconds=2.0, retry_seconds=0.5):
+        self.iou_threshold = iou_threshold
+        self.max_centroid_shift = max_centroid_shift
+        self.max_missed = max_missed
+        self.reverify_seconds = reverify_seconds
+        self.retry_seconds = retry_seconds
+        self.tracks = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def update(self, boxes, now):
+        """Associate detections with tracks; returns the track ID for each box, in order."""
+        with self._lock:
+            pairs = []
+            for track in self.tracks.values():
+                for i, box in enumerate(boxes):
+                    iou = box_iou(track.box, box)
+                    if iou >= self.iou_threshold:
+                        pairs.append((1.0 + iou, track.track_id, i))
+                    elif centroid_shift(track.box, box) <= self.max_centroid_shift:
+                        pairs.append((1.0 - centroid_shift(track.box, box), track.track_id, i))
+            pairs.sort(reverse=True)
+
+            assigned = {}
+            used_tracks = set()
+            for _, track_id, i in pairs:
+                if i in assigned or track_id in used_tracks:
+                    continue
+                assigned[i] = track_id
+                used_tracks.add(track_id)
+
+            for i, box in enumerate(boxes):
+                if i in assigned:
+                    track = self.tracks[assigned[i]]
+                    track.box = box
+                    track.last_seen = now
+                    track.missed = 0
+                else:
+                    track = Track(next(self._ids), box, now)
+                    self.tracks[track.track_id] = track
+                    assigned[i] = track.track_id
+                    used_tracks.add(track.track_id)
+
+            for track_id in list(self.tracks):
+                if track_id not in used_tracks:
+                    self.tracks[track_id].missed += 1
+                    if self.tracks[track_id].missed > self.max_missed:
+                        del self.tracks[track_id]
+
+            return [assigned[i] for i in range(len(boxes))]
+
+    def needs_encoding(self, track_id, now):
+        with self._lock:
+            track = self.tracks.get(track_id)
+            if track is None or track.last_encoded is None:
+                return True
+            interval = self.reverify_seconds if track.recognized else self.retry_seconds
+            return now - track.last_encoded >= interval
+
+    def assign(self, track_id, emp_id, distance, recognized, now):
+        """Store the identity found by a fresh encoding for a track."""
+        with self._lock:
+            track = self.tracks.get(track_id)
+            if track is None:
+                return
+            track.emp_id = emp_id
+            track.distance = distance
+            track.recognized = recognized
+            track.last_encoded = now
+
+    def identity(self, track_id):
+        """Return the carried-forward (emp_id, distance), or None if never matched."""
+        with self._lock:
+            track = self.tracks.get(track_id)
+            if track is None or track.emp_id is None:
+                return None
+            return track.emp_id, track.distance
+
+    def reset(self):
+        with self._lock:
+            self.tracks.clear()
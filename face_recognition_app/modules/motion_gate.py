@@ -0,0 +1,49 @@
+import cv2
+
+
+class MotionGate:
+    """
+    Cheap motion detector used to skip face detection on an empty scene.
+
+    Each frame is shrunk to ``width`` pixels, converted to blurred grayscale
+    and compared with a running-average background. Motion is reported when
+    more than ``min_area`` of the pixels differ by over ``threshold`` grey
+    levels, and the gate stays open for ``hold_seconds`` afterwards so a
+    person standing still in front of the camera is still recognized.
+    """
+
+    def __init__(self, width=160, threshold=25, min_area=0.01, hold_seconds=3.0, learning_rate=0.05):
+        self.width = width
+        self.threshold = threshold
+        self.min_area = min_area
+        self.hold_seconds = hold_seconds
+        self.learning_rate = learning_rate
+        self.background = None
+        self.last_motion = None
+
+    def _prepare(self, frame):
+        height = max(1, int(frame.shape[0] * self.width / frame.shape[1]))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def update(self, frame, now):
+        """Feed a BGR frame; returns True while the scene is (or recently was) moving."""
+        gray = self._prepare(frame)
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype("float32")
+            self.last_motion = now
+            return True
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        changed = cv2.countNonZero(cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)[1])
+        cv2.accumulateWeighted(gray, self.background, self.learning_rate)
+        if changed > self.min_area * gray.size:
+            self.last_motion = now
+        return self.is_active(now)
+
+    def is_active(self, now):
+        return self.last_motion is not None and now - self.last_motion <= self.hold_seconds
+
+    def reset(self):
+        self.background = None
+        self.last_motion = None
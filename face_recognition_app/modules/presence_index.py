@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+def today_key():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+class PresenceIndex:
+    """
+    In-memory set of employee IDs marked on the current day.
+
+    Both the face app and the dashboard keep one: it is rebuilt through
+    ``loader(day)`` (an iterable of IDs, day as YYYY-MM-DD) when first used,
+    whenever the day rolls over and - if ``version_fn`` is given - whenever
+    its value changes (e.g. the store was written to by another process).
+    The owner calls ``add`` after every successful write. Lookups are a set
+    membership test, independent of how much attendance history exists.
+
+    IDs added locally survive a reload until the loader reports them or
+    ``pending_seconds`` pass, so an event that was just published is not
+    forgotten before the store has caught up with it.
+    """
+
+    def __init__(self, loader, version_fn=None, pending_seconds=120):
+        self.loader = loader
+        self.version_fn = version_fn
+        self.pending_seconds = pending_seconds
+        self.lock = threading.Lock()
+        self.day = None
+        self.version = None
+        self.ids = set()
+        self.pending = {}
+
+    def _ensure_day(self, day):
+        # Caller holds the lock
+        version = self.version_fn() if self.version_fn is not None else None
+        if day != self.day or version != self.version:
+            loaded = set(str(emp_id) for emp_id in self.loader(day))
+            if day != self.day:
+                self.pending = {}
+            cutoff = time.time() - self.pending_seconds
+            self.pending = {emp_id: added for emp_id, added in self.pending.items()
+                            if emp_id not in loaded and added >= cutoff}
+            self.ids = loaded | set(self.pending)
+            self.day = day
+            self.version = version
+
+    def contains(self, emp_id, day=None):
+        with self.lock:
+            self._ensure_day(day or today_key())
+            return str(emp_id) in self.ids
+
+    def add(self, emp_id, day=None):
+        """Record a mark; returns False if the employee was already present."""
+        with self.lock:
+            self._ensure_day(day or today_key())
+            emp_id = str(emp_id)
+            if emp_id in self.ids:
+                return False
+            self.ids.add(emp_id)
+            if self.version_fn is not None:
+                self.pending[emp_id] = time.time()
+            return True
+
+    def clear(self, day=None):
+        """Forget every mark for ``day`` (after its entries were deleted)."""
+        with self.lock:
+            self._ensure_day(day or today_key())
+            self.ids = set()
+            self.pending = {}
+
+    def __len__(self):
+        with self.lock:
+            return len(self.ids)
+
+
+def store_version(db_path):
+    """Identity (mtime + size) of the store's database and WAL file - changes on every write."""
+    identity = []
+    for path in (db_path, db_path + '-wal'):
+        try:
+            file_stat = os.stat(path)
+            identity.append((file_stat.st_mtime_ns, file_stat.st_size))
+        except OSError:
+            identity.append(None)
+    return tuple(identity)
+
+
+def store_ids(db_path, day):
+    """Employee IDs marked on ``day`` in the dashboard's attendance store (read-only)."""
+    if not os.path.exists(db_path):
+        return set()
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5)
+        try:
+            rows = conn.execute("SELECT employee_id FROM attendance WHERE date = ?", (day,)).fetchall()
+        finally:
+            conn.close()
+        return set(r[0] for r in rows)
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not read attendance store for presence index: {e}")
+        return set()
@@ -0,0 +1,109 @@
+import collections
+import threading
+import time
+
+
+class DropOldestQueue:
+    """
+    Bounded hand-off queue between pipeline stages.
+    When full, ``put`` discards the oldest item instead of blocking, so a slow
+    stage always works on the most recent frame rather than a backlog.
+    """
+
+    def __init__(self, maxsize=1):
+        self._items = collections.deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the oldest queued item, or None on timeout."""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def clear(self):
+        with self._cond:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class RecognitionPipeline:
+    """
+    Runs recognition stages (e.g. detect -> encode -> match) in worker threads
+    connected by bounded drop-oldest queues.
+
+    Each stage is ``(name, fn)``; ``fn(item)`` receives the per-frame dict
+    and returns it (possibly updated) to pass it on, or None to stop
+    processing that frame. Items leaving the last stage are handed to
+    ``on_result`` from the worker thread, so GUI code should re-post them
+    (e.g. through a Qt signal).
+    """
+
+    def __init__(self, stages, on_result, queue_size=1):
+        self.stages = stages
+        self.on_result = on_result
+        self.queues = [DropOldestQueue(queue_size) for _ in stages]
+        self.threads = []
+        self.running = threading.Event()
+        self.frame_id = 0
+
+    def start(self):
+        if self.running.is_set():
+            return
+        self.running.set()
+        self.threads = []
+        for i, (name, fn) in enumerate(self.stages):
+            out_q = self.queues[i + 1] if i + 1 < len(self.queues) else None
+            thread = threading.Thread(target=self._run_stage, args=(name, fn, self.queues[i], out_q),
+                                      name=f"recognition-{name}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=1.0):
+        self.running.clear()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+        for q in self.queues:
+            q.clear()
+
+    def submit(self, frame, **extra):
+        """Queue a frame for recognition; never blocks the caller."""
+        if not self.running.is_set():
+            return
+        self.frame_id += 1
+        item = {"frame_id": self.frame_id, "timestamp": time.time(), "frame": frame}
+        item.update(extra)
+        self.queues[0].put(item)
+
+    def _run_stage(self, name, fn, in_q, out_q):
+        while self.running.is_set():
+            item = in_q.get(timeout=0.1)
+            if item is None:
+                continue
+            try:
+                item = fn(item)
+            except Exception as e:
+                print(f"❌ Recognition stage '{name}' failed: {e}")
+                item = None
+            if item is None:
+                continue
+            if out_q is not None:
+                out_q.put(item)
+            else:
+                try:
+                    self.on_result(item)
+                except Exception as e:
+                    print(f"❌ Recognition result handler failed: {e}")
@@ -0,0 +1,47 @@
+import collections
+
+
+class RecognitionThrottle:
+    """
+    Per-identity cooldown and recognition count.
+
+    Entries live in an OrderedDict ordered by last activity, so expired
+    identities are pruned from the front in O(1) each and memory stays
+    proportional to the people seen within ``ttl`` seconds.
+    """
+
+    def __init__(self, cooldown=5.0, max_count=3, ttl=8 * 3600):
+        self.cooldown = cooldown
+        self.max_count = max_count
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()  # emp_id -> [last_time, count]
+
+    def _prune(self, now):
+        while self._entries:
+            emp_id, (last_time, _) = next(iter(self._entries.items()))
+            if now - last_time < self.ttl:
+                break
+            self._entries.popitem(last=False)
+
+    def in_cooldown(self, emp_id, now):
+        self._prune(now)
+        entry = self._entries.get(emp_id)
+        return entry is not None and now - entry[0] <= self.cooldown
+
+    def count(self, emp_id):
+        entry = self._entries.get(emp_id)
+        return entry[1] if entry else 0
+
+    def limit_reached(self, emp_id):
+        return self.count(emp_id) >= self.max_count
+
+    def touch(self, emp_id, now, counted=False):
+        """Start a new cooldown for ``emp_id``; ``counted`` also bumps its recognition count."""
+        entry = self._entries.pop(emp_id, [now, 0])
+        entry[0] = now
+        if counted:
+            entry[1] += 1
+        self._entries[emp_id] = entry
+
+    def __len__(self):
+        return len(self._entries)
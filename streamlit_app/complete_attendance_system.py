@@ -11,14 +11,10 @@ import io
 import base64
 import threading
 import queue
+import secrets
 import plotly.express as px
 import sys
 import joblib
-from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from openpyxl import load_workbook
 
 # Set page config
 st.set_page_config(
@@ -206,87 +202,170 @@ def authenticate(username, password):
     credentials = load_credentials()
     return username in credentials and credentials[username] == password
 
-# Face recognition integration
-RECOGNIZED_ID_FILE = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared', 'recognized_id.json')
+# Add the face_recognition_app modules to the path
+face_recognition_path = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app')
+if face_recognition_path not in sys.path:
+    sys.path.append(face_recognition_path)
+
+from modules.event_log import EVENT_LOG_DIRNAME, EventLogReader, list_segments, read_latest_event
+from modules.event_channel import EventListener, default_address, load_authkey
+from modules.presence_index import PresenceIndex, store_version, today_key
+from modules.attendance_store import AttendanceStore, SnapshotCache, month_bounds, to_iso_date
+from modules.attendance_writer import AttendanceWriter
+from modules.report_scheduler import ReportScheduler
+from modules.wide_report import WideReportUpdater
+from modules.report_jobs import write_monthly_employee_report, write_wide_report
+from modules.attendance_export import EXPORT_FORMATS, available_formats, clean_exports, day_after, export_attendance, export_file_name
+
+# Attendance store - SQLite is the system of record, Attendance_Raw_<Month>.xlsx is only an export
+ATTENDANCE_DB = os.path.join(BASE_DIR, 'data', 'attendance.db')
+# Parquet history (python -m modules.attendance_archive archive ...) and prepared downloads
+ARCHIVE_DIR = os.path.join(BASE_DIR, 'data', 'archive')
+# Exports are served from Streamlit's static folder (server.enableStaticServing), which streams
+# files from disk; each export gets an unguessable folder and is removed after a day
+EXPORT_DIR = os.path.join(BASE_DIR, 'static', 'exports')
+EXPORT_URL_PREFIX = 'app/static/exports'
+# Larger exports are split into parts below Streamlit's 200 MB static file limit
+EXPORT_PART_MB = 100
+
+@st.cache_resource
+def get_attendance_store():
+    """One store per server process; legacy raw workbooks are imported once"""
+    store = AttendanceStore(ATTENDANCE_DB)
+    imported = store.import_raw_workbooks(EXCEL_DIR)
+    if imported:
+        print(f"📥 Imported {imported} attendance rows from raw Excel workbooks")
+    return store
+
+@st.cache_resource
+def get_snapshot_cache():
+    """Shared by all sessions; re-parses only when the database files change"""
+    return SnapshotCache(get_attendance_store(), lambda: store_version(ATTENDANCE_DB))
+
+def get_attendance_snapshot():
+    """This month's marks plus today's rows, counts and IDs - read-only"""
+    return get_snapshot_cache().get()
+
+@st.cache_resource
+def get_presence_index():
+    """Today's marked employee IDs, loaded from the store and updated on every write"""
+    store = get_attendance_store()
+    return PresenceIndex(store.marked_ids)
+
+@st.cache_resource
+def get_attendance_writer():
+    """The only writer to the store - every session queues its writes here (group commit)"""
+    presence = get_presence_index()
+    
+    def on_applied(method_name, args, result):
+        # Replayed recognition events can mark earlier days - the index only tracks today
+        if method_name == 'mark' and result and to_iso_date(args[2]) == today_key():
+            presence.add(args[0])
+        elif method_name == 'delete_day':
+            presence.clear(to_iso_date(args[0]))
+    
+    return AttendanceWriter(get_attendance_store(), on_applied).start()
+
+def load_month_attendance():
+    """Current month's marks in the raw layout (Employee ID, Name, Date, Entry_Time, Status)"""
+    return get_attendance_snapshot().month
 
-def check_face_recognition():
-    """Check for new face recognition from JSON file - Auto-save detected IDs"""
+def build_monthly_wide_report(df):
+    """Full build of this month's wide report - the same builder the batch CLI uses"""
+    if df.empty:
+        print("Warning: No data to generate Excel report")
+        return None
     try:
-        if os.path.exists(RECOGNIZED_ID_FILE):
-            if os.path.getsize(RECOGNIZED_ID_FILE) > 0:
-                with open(RECOGNIZED_ID_FILE, 'r') as f:
-                    data = json.load(f)
-                
-                emp_id = data.get('employee_id')
-                name = data.get('name')
-                unique_id = data.get('unique_id')
-                
-                if emp_id and unique_id:
-                    # Always mark attendance (allow multiple entries per day)
-                    if not name:
-                        # If name is missing, try to get it from employee data
-                        try:
-                            employee_df = load_employee_data()
-                            if employee_df is not None and not employee_df.empty:
-                                emp_row = employee_df[employee_df['Employee ID'] == emp_id]
-                                if not emp_row.empty:
-                                    name = emp_row['Name'].iloc[0]
-                        except Exception as e:
-                            print(f"Error getting employee name: {e}")
-                            name = f"Employee {emp_id}"
-                    
-                    success, message = mark_attendance(emp_id, name or f"Employee {emp_id}")
-                    if success:
-                        # Clear the JSON file after processing
-                        try:
-                            os.remove(RECOGNIZED_ID_FILE)
-                        except:
-                            pass
-                        return True, f"✅ Face Recognition: {name or emp_id} ({emp_id}) detected and marked!"
-                    else:
-                        return False, f"❌ Face Recognition: {message}"
-                else:
-                    return False, "❌ Face Recognition: Invalid data in JSON file"
-            else:
-                return False, "ℹ️ Face Recognition: No new detection data"
-        else:
-            return False, "ℹ️ Face Recognition: No detection file found"
-    except json.JSONDecodeError:
-        # Clear corrupted JSON file
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-        except:
-            pass
-        return False, "❌ Face Recognition: Corrupted detection data"
+        return write_wide_report(df, get_report_path())
     except Exception as e:
-        print(f"Error reading face recognition JSON: {e}")
-        return False, f"❌ Face Recognition: Error reading data"
-    
-    return False, None
+        print(f"Error creating styled Excel report: {e}")
+        return None
+
+def get_report_path():
+    return os.path.join(EXCEL_DIR, f'Attendance_Report_{get_month_year()}.xlsx')
+
+@st.cache_resource
+def get_report_scheduler():
+    """Background, coalescing updates of Attendance_Report_<Month>.xlsx - patched in place when possible"""
+    updater = WideReportUpdater(build_monthly_wide_report)
+    return ReportScheduler(
+        load_month_attendance,
+        lambda df: updater.update(df, get_report_path()),
+        get_report_path,
+        reset_fn=updater.invalidate,
+    ).start()
+
+def export_raw_excel():
+    """Export the current month from the store to Attendance_Raw_<Month>.xlsx"""
+    now = datetime.now()
+    raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
+    start, end = month_bounds(now.year, now.month)
+    return get_attendance_writer().submit('export_excel', raw_file, start, end).result(timeout=60)
+
+# Face recognition integration - the face app appends one JSON line per event to daily segments
+RECOGNITION_LOG_DIR = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared', EVENT_LOG_DIRNAME)
+
+@st.cache_resource
+def get_recognition_reader():
+    """One event log consumer per server process; its checkpoint survives restarts"""
+    return EventLogReader(RECOGNITION_LOG_DIR, consumer="dashboard")
+
+# Optional push channel: the face app also sends each event over a local socket/pipe
+RECOGNITION_SHARED_DIR = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared')
+RECOGNITION_CHANNEL_ADDRESS = default_address(RECOGNITION_SHARED_DIR)
+
+def ingest_pushed_event(event):
+    """Pushed events are already in the file log - ingest them now instead of on the next poll"""
+    success, message = process_multiple_face_recognition()
+    if success:
+        print(f"📡 Pushed event ingested: {message}")
+
+@st.cache_resource
+def start_recognition_listener():
+    """Start the push channel listener once per server process; polling remains the fallback"""
+    listener = EventListener(RECOGNITION_CHANNEL_ADDRESS, ingest_pushed_event, load_authkey(RECOGNITION_SHARED_DIR))
+    listener.start()
+    return listener
+
+def get_recognition_log_stat():
+    """Return (total_size, last_mtime) of the event log, or None if there are no segments"""
+    segments = list_segments(RECOGNITION_LOG_DIR)
+    if not segments:
+        return None
+    total_size, last_mtime = 0, 0
+    for name in segments:
+        try:
+            file_stat = os.stat(os.path.join(RECOGNITION_LOG_DIR, name))
+        except OSError:
+            continue
+        total_size += file_stat.st_size
+        last_mtime = max(last_mtime, file_stat.st_mtime)
+    return total_size, last_mtime
 
 def get_face_recognition_status():
     """Get current face recognition status with detailed information"""
-    if os.path.exists(RECOGNIZED_ID_FILE):
+    if get_recognition_log_stat() is not None:
         try:
-            with open(RECOGNIZED_ID_FILE, 'r') as f:
-                data = json.load(f)
-                emp_id = data.get('employee_id', 'Unknown')
-                name = data.get('name', 'Unknown')
-                timestamp = data.get('timestamp', '')
-                status = data.get('status', 'Unknown')
-                
-                if timestamp:
-                    try:
-                        # Parse timestamp and show time
-                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        time_str = dt.strftime('%H:%M:%S')
-                        return f"🟢 Active - {name} ({emp_id}) at {time_str} - {status}"
-                    except:
-                        return f"🟢 Active - {name} ({emp_id}) - {status}"
-                else:
+            data = read_latest_event(RECOGNITION_LOG_DIR)
+            if data is None:
+                return "🟡 Connected - Waiting for detections"
+            emp_id = data.get('employee_id', 'Unknown')
+            name = data.get('name', 'Unknown')
+            timestamp = data.get('timestamp', '')
+            status = data.get('status', 'Unknown')
+            
+            if timestamp:
+                try:
+                    # Parse timestamp and show time
+                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                    time_str = dt.strftime('%H:%M:%S')
+                    return f"🟢 Active - {name} ({emp_id}) at {time_str} - {status}"
+                except:
                     return f"🟢 Active - {name} ({emp_id}) - {status}"
+            else:
+                return f"🟢 Active - {name} ({emp_id}) - {status}"
         except Exception as e:
-            return "🟡 Connected - JSON file exists but has errors"
+            return "🟡 Connected - Event log exists but has errors"
     else:
         return "🔴 Not Connected - Start face recognition app"
 
@@ -329,9 +408,13 @@ def simulate_face_detection():
 
 # Load employee data
 def load_employee_data():
-    # First check if we have uploaded CSV data in session state
-    if st.session_state.uploaded_csv_data is not None:
-        return pd.DataFrame(st.session_state.uploaded_csv_data)
+    # First check if we have uploaded CSV data in session state (absent on background ingestion threads)
+    try:
+        uploaded_csv_data = st.session_state.get('uploaded_csv_data')
+    except Exception:
+        uploaded_csv_data = None
+    if uploaded_csv_data is not None:
+        return pd.DataFrame(uploaded_csv_data)
     
     # Otherwise load from file
     emp_file = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared', 'employees_data.csv')
@@ -348,128 +431,51 @@ def load_employee_data():
     }
     return pd.DataFrame(default_data)
 
-def generate_wide_excel(df, filename):
-    """Generate wide format Excel report with proper totals and formatting"""
-    # Check if dataframe is empty
-    if df.empty:
-        print("Warning: No data to generate Excel report")
-        return None
-    
-    try:
-        # Convert Date column to datetime
-        df['Date'] = pd.to_datetime(df['Date'])
-        
-        # Format date display based on OS
-        if os.name == 'nt':
-            df['Date_Display'] = df['Date'].dt.strftime('%B %#d, %Y')
-        else:
-            df['Date_Display'] = df['Date'].dt.strftime('%B %-d, %Y')
-        
-        # Create pivot table
-        pivot_df = df.pivot_table(
-            index=['Employee ID', 'Name'],
-            columns='Date_Display',
-            values='Status',
-            aggfunc='first'
-        ).reset_index()
-        
-        # Fill NaN values with empty string
-        pivot_df = pivot_df.fillna('')
-        
-        # Calculate totals correctly - only count status columns (skip Employee ID and Name)
-        status_columns = [col for col in pivot_df.columns if col not in ['Employee ID', 'Name']]
-        
-        # Calculate totals for each employee
-        if status_columns:
-            pivot_df['Total Present'] = pivot_df[status_columns].apply(lambda x: (x == 'Present').sum(), axis=1)
-            pivot_df['Total Late'] = pivot_df[status_columns].apply(lambda x: (x == 'Late').sum(), axis=1)
-            pivot_df['Total Absent'] = pivot_df[status_columns].apply(lambda x: (x == 'Absent').sum(), axis=1)
-            pivot_df['Total Leaves'] = pivot_df[status_columns].apply(lambda x: (x == 'Leave').sum(), axis=1)
-        else:
-            # If no status columns, add empty total columns
-            pivot_df['Total Present'] = 0
-            pivot_df['Total Late'] = 0
-            pivot_df['Total Absent'] = 0
-            pivot_df['Total Leaves'] = 0
-        
-        # Generate filename
-        actual_filename = f'Attendance_Report_{get_month_year()}.xlsx'
-        
-        # Create styled Excel report
-        try:
-            create_styled_excel_report(pivot_df, actual_filename)
-            return actual_filename
-        except Exception as e:
-            print(f"Error creating styled Excel report: {e}")
-            return None
-            
-    except Exception as e:
-        print(f"Error in generate_wide_excel: {e}")
-        return None
+# Outcomes of mark_attendance_at
+MARK_SAVED = 'saved'
+MARK_DUPLICATE = 'duplicate'
+MARK_FAILED = 'failed'
 
 # Mark attendance
 def mark_attendance(emp_id, name):
     """Mark attendance for an employee with proper Excel format"""
-    now = datetime.now()
-    today_date_col = get_today_date()
-    entry_time = now.replace(second=0, microsecond=0).time()
+    outcome, message = mark_attendance_at(emp_id, name, datetime.now())
+    return outcome == MARK_SAVED, message
+
+def mark_attendance_at(emp_id, name, when):
+    """Mark attendance on the day and at the time of ``when`` (e.g. a recognition event's timestamp)"""
+    day = when.strftime("%d/%m/%Y")
+    entry_time = when.replace(second=0, microsecond=0).time()
     status = fallback_time_based_prediction(entry_time)
     
     print(f"⏰ Time-based prediction for {emp_id}: {entry_time.strftime('%H:%M')} - Status: {status}")
     
-    raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-    
+    # Queue the insert on the writer - the unique (date, employee_id) index rejects duplicates
     try:
-        if os.path.exists(raw_file):
-            df_existing = pd.read_excel(raw_file)
-        else:
-            df_existing = pd.DataFrame(columns=['Employee ID', 'Name', 'Date', 'Entry_Time', 'Status'])
-    except Exception as e:
-        print(f"Error loading existing data: {e}")
-        df_existing = pd.DataFrame(columns=['Employee ID', 'Name', 'Date', 'Entry_Time', 'Status'])
-
-    # Check for duplicate entry
-    already_marked = False
-    if not df_existing.empty:
-        today_entries = df_existing[df_existing['Date'] == today_date_col]
-        if not today_entries.empty:
-            already_marked = (today_entries['Employee ID'] == emp_id).any()
-
-    if already_marked:
-        return False, f"Employee {name} ({emp_id}) already marked attendance today"
-
-    # Create new record
-    new_record = pd.DataFrame([{
-        'Employee ID': emp_id,
-        'Name': name,
-        'Date': today_date_col,
-        'Entry_Time': entry_time,
-        'Status': status
-    }])
-
-    # Save combined data
-    try:
-        df_combined = pd.concat([df_existing, new_record], ignore_index=True)
-        df_combined.to_excel(raw_file, index=False)
+        if not get_attendance_writer().mark(emp_id, name, day, entry_time, status).result(timeout=10):
+            when_text = "today" if day == get_today_date() else f"on {day}"
+            return MARK_DUPLICATE, f"Employee {name} ({emp_id}) already marked attendance {when_text}"
         print(f"✅ Saved attendance data for {emp_id}")
     except Exception as e:
         print(f"❌ Error saving data: {e}")
-        return False, f"Failed to save attendance data for {name} ({emp_id})"
+        return MARK_FAILED, f"Failed to save attendance data for {name} ({emp_id})"
     
-    # Auto-generate styled Excel report with wide format
+    # The styled wide report is rebuilt in the background once the burst of marks settles
     try:
-        actual_filename = generate_wide_excel(df_combined, f'Attendance_Report_{get_month_year()}.xlsx')
-        if actual_filename:
-            st.cache_data.clear()
-            return True, f"Marked {name} ({emp_id}) as {status} at {entry_time.strftime('%H:%M')}"
-        else:
-            print(f"Warning: Excel generation failed")
-            return True, f"Marked {name} ({emp_id}) as {status} at {entry_time.strftime('%H:%M')}"
+        get_report_scheduler().request()
     except Exception as e:
-        print(f"Warning: Excel styling failed: {e}")
-        return True, f"Marked {name} ({emp_id}) as {status} at {entry_time.strftime('%H:%M')}"
-    
-    return False, f"Failed to mark attendance for {name} ({emp_id})"
+        print(f"Warning: could not schedule report rebuild: {e}")
+    return MARK_SAVED, f"Marked {name} ({emp_id}) as {status} at {entry_time.strftime('%H:%M')}"
+
+def event_datetime(event):
+    """Local time of a recognition event; events without a readable timestamp count as now"""
+    try:
+        event_time = datetime.fromisoformat(event.get('timestamp', '').replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return datetime.now()
+    if event_time.tzinfo is not None:
+        event_time = event_time.astimezone().replace(tzinfo=None)
+    return event_time
 
 def predict_attendance_with_rf_model(emp_id, name, entry_time):
     """Use the best RF model to predict attendance status"""
@@ -556,69 +562,24 @@ def mark_attendance_with_time(emp_id, name, time_str):
     
     print(f"⏰ RF Model test prediction for {emp_id}: {test_time.strftime('%H:%M')} - Status: {status}")
     
-    # Load existing data
-    raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-    
-    try:
-        if os.path.exists(raw_file):
-            df_existing = pd.read_excel(raw_file)
-        else:
-            df_existing = pd.DataFrame(columns=['Employee ID', 'Name', 'Date', 'Entry_Time', 'Status'])
-    except Exception as e:
-        df_existing = pd.DataFrame(columns=['Employee ID', 'Name', 'Date', 'Entry_Time', 'Status'])
-
-    # Check for duplicate
-    already_marked = False
-    if not df_existing.empty:
-        today_entries = df_existing[df_existing['Date'] == today_date_col]
-        if not today_entries.empty:
-            already_marked = (today_entries['Employee ID'] == emp_id).any()
-
-    if already_marked:
+    # Queue the insert with the test time - duplicates are rejected by the store
+    if not get_attendance_writer().mark(emp_id, name, today_date_col, test_time, status).result(timeout=10):
         return False, f"Employee {name} ({emp_id}) already marked attendance today"
-
-    # Create new record with test time
-    new_record = pd.DataFrame([{
-        'Employee ID': emp_id,
-        'Name': name,
-        'Date': today_date_col,
-        'Entry_Time': test_time,
-        'Status': status
-    }])
-
-    # Save combined data
-    df_combined = pd.concat([df_existing, new_record], ignore_index=True)
-    df_combined.to_excel(raw_file, index=False)
     
-    # Auto-generate styled Excel report with wide format
+    # The styled wide report is rebuilt in the background once the burst of marks settles
     try:
-        actual_filename = generate_wide_excel(df_combined, f'Attendance_Report_{get_month_year()}.xlsx')
-        if actual_filename:
-            st.cache_data.clear()
-            return True, f"Test: Marked {name} ({emp_id}) as {status} at {test_time.strftime('%H:%M')}"
-        else:
-            print(f"Warning: Excel generation failed")
-            return True, f"Test: Marked {name} ({emp_id}) as {status} at {test_time.strftime('%H:%M')}"
+        get_report_scheduler().request()
     except Exception as e:
-        print(f"Warning: Excel styling failed: {e}")
-        return True, f"Test: Marked {name} ({emp_id}) as {status} at {test_time.strftime('%H:%M')}"
+        print(f"Warning: could not schedule report rebuild: {e}")
+    return True, f"Test: Marked {name} ({emp_id}) as {status} at {test_time.strftime('%H:%M')}"
     
     return False, f"Failed to mark test attendance for {name} ({emp_id})"
 
 def auto_update_daily_excel():
-    """Auto-update daily Excel report in wide format with totals"""
+    """Auto-update daily Excel report in wide format with totals - scheduled, skipped if nothing changed"""
     try:
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            df = pd.read_excel(raw_file)
-            if not df.empty:
-                # Generate wide format Excel report with totals
-                actual_filename = generate_wide_excel(df, f'Attendance_Report_{get_month_year()}.xlsx')
-                if actual_filename:
-                    return True
-                else:
-                    print("Warning: Excel generation failed in auto_update")
-                    return False
+        get_report_scheduler().request()
+        return True
     except Exception as e:
         print(f"Error auto-updating Excel: {e}")
         return False
@@ -641,11 +602,6 @@ import joblib
 import sys
 import os
 
-# Add the face_recognition_app modules to the path
-face_recognition_path = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app')
-if face_recognition_path not in sys.path:
-    sys.path.append(face_recognition_path)
-
 def get_logo_base64():
     """Get logo as base64 string"""
     try:
@@ -661,241 +617,26 @@ def get_logo_base64():
         return ""
 
 # Excel styling function
-def style_excel(file_path):
-    """Apply professional styling to Excel file with black, red, white theme and total statistics"""
-    try:
-        wb = load_workbook(file_path)
-        ws = wb.active
-
-        # Get the original data before inserting rows
-        original_data = []
-        for row in ws.iter_rows(min_row=2):  # Skip header row
-            row_data = [cell.value for cell in row]
-            if any(row_data):  # Only add non-empty rows
-                original_data.append(row_data)
-
-        # Calculate total statistics from original data
-        total_present = 0
-        total_late = 0
-        total_absent = 0
-        total_leaves = 0
-        total_employees = len(original_data)
-        
-        # Count statuses from the data (assuming status columns are after Employee ID and Name)
-        for row in original_data:
-            if len(row) > 2:  # Has status columns
-                for cell_value in row[2:]:  # Skip Employee ID and Name
-                    if isinstance(cell_value, str):
-                        if cell_value.strip() == 'Present':
-                            total_present += 1
-                        elif cell_value.strip() == 'Late':
-                            total_late += 1
-                        elif cell_value.strip() == 'Absent':
-                            total_absent += 1
-                        elif cell_value.strip() == 'Leave':
-                            total_leaves += 1
-
-        # Insert and style title row
-        ws.insert_rows(1)
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=ws.max_column)
-        title_cell = ws.cell(row=1, column=1)
-        title_cell.value = "MSN GLOBAL IT SOLUTIONS - Attendance Report"
-        title_cell.font = Font(size=16, bold=True, color="FF0000", name="Calibri")
-        title_cell.fill = PatternFill("solid", fgColor="000000")  # Black background
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Insert statistics rows
-        for i in range(6):  # Increased to 6 for additional stats
-            ws.insert_rows(2)
-        
-        # Add statistics
-        stats_data = [
-            f"Total Employees: {total_employees}",
-            f"Total Present: {total_present}",
-            f"Total Late: {total_late}",
-            f"Total Absent: {total_absent}",
-            f"Total Leaves: {total_leaves}",
-            f"Report Generated: {datetime.now().strftime('%B %d, %Y at %H:%M')}"
-        ]
-        
-        for i, stat in enumerate(stats_data, 2):
-            cell = ws.cell(row=i, column=1)
-            cell.value = stat
-            cell.font = Font(size=12, bold=True, color="FFFFFF", name="Calibri")
-            cell.fill = PatternFill("solid", fgColor="1C1C1C")  # Dark background for stats
-            cell.alignment = Alignment(horizontal="left", vertical="center")
-            # Merge cells for statistics
-            ws.merge_cells(start_row=i, start_column=1, end_row=i, end_column=ws.max_column)
-
-        # Define fills and fonts
-        header_fill = PatternFill("solid", fgColor="C80000")  # Red for headers
-        row_fill_1 = PatternFill("solid", fgColor="1C1C1C")   # Almost black
-        row_fill_2 = PatternFill("solid", fgColor="EDEDED")   # Light gray
-
-        border = Border(
-            left=Side(style='thin', color='000000'),
-            right=Side(style='thin', color='000000'),
-            top=Side(style='thin', color='000000'),
-            bottom=Side(style='thin', color='000000')
-        )
-
-        # Style column headers (now at row 9 due to additional stats)
-        for col in range(1, ws.max_column + 1):
-            cell = ws.cell(row=9, column=col)
-            cell.fill = header_fill
-            cell.font = Font(bold=True, color="FFFFFF", name="Calibri")  # White bold text
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-
-        # Style body cells with alternating row colors (starting from row 10)
-        for i, row in enumerate(ws.iter_rows(min_row=10, max_row=ws.max_row, min_col=1, max_col=ws.max_column)):
-            fill = row_fill_1 if i % 2 == 0 else row_fill_2
-            font_color = "FFFFFF" if fill == row_fill_1 else "000000"
-            for cell in row:
-                cell.fill = fill
-                cell.font = Font(name="Calibri", color=font_color)
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = border
-
-        # Auto-adjust column widths
-        for col in ws.columns:
-            max_length = max(len(str(cell.value or "")) for cell in col)
-            ws.column_dimensions[get_column_letter(col[0].column)].width = max_length + 3
-
-        # Save styled workbook
-        wb.save(file_path)
-        
-    except Exception as e:
-        print(f"Error in style_excel: {e}")
-
 def create_monthly_employee_report():
     """Create monthly employee-wise report with total statistics for each employee"""
     try:
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            df = pd.read_excel(raw_file)
-            if not df.empty:
-                # Load employee data
-                employee_df = load_employee_data()
-                if employee_df is not None and not employee_df.empty:
-                    # Create employee-wise summary
-                    employee_summary = []
-                    
-                    for _, emp_row in employee_df.iterrows():
-                        emp_id = emp_row['Employee ID']
-                        emp_name = emp_row['Name']
-                        
-                        # Get all entries for this employee
-                        emp_entries = df[df['Employee ID'] == emp_id]
-                        
-                        # Calculate statistics for this employee
-                        total_present = len(emp_entries[emp_entries['Status'] == 'Present'])
-                        total_late = len(emp_entries[emp_entries['Status'] == 'Late'])
-                        total_absent = len(emp_entries[emp_entries['Status'] == 'Absent'])
-                        total_leave = len(emp_entries[emp_entries['Status'] == 'Leave'])
-                        total_entries = len(emp_entries)
-                        
-                        employee_summary.append({
-                            'Employee ID': emp_id,
-                            'Name': emp_name,
-                            'Total Present': total_present,
-                            'Total Late': total_late,
-                            'Total Absent': total_absent,
-                            'Total Leave': total_leave,
-                            'Total Entries': total_entries
-                        })
-                    
-                    # Create DataFrame
-                    summary_df = pd.DataFrame(employee_summary)
-                    
-                    # Save to Excel with styling
-                    monthly_filename = f'Monthly_Employee_Report_{get_month_year()}.xlsx'
-                    create_styled_excel_report(summary_df, monthly_filename)
-                    
-                    return True, f"✅ Monthly employee report generated: {monthly_filename}"
-                else:
-                    return False, "❌ No employee data available"
+        df = load_month_attendance()
+        if not df.empty:
+            # Load employee data
+            employee_df = load_employee_data()
+            if employee_df is not None and not employee_df.empty:
+                # Employee-wise summary joined to the roster, styled in one streaming pass
+                monthly_filename = f'Monthly_Employee_Report_{get_month_year()}.xlsx'
+                write_monthly_employee_report(df, employee_df, os.path.join(EXCEL_DIR, monthly_filename), get_month_year())
+                
+                return True, f"✅ Monthly employee report generated: {monthly_filename}"
             else:
-                return False, "❌ No attendance data available"
+                return False, "❌ No employee data available"
         else:
-            return False, "❌ No attendance file found"
+            return False, "❌ No attendance data available"
     except Exception as e:
         return False, f"❌ Error generating monthly report: {str(e)}"
 
-def style_monthly_excel(file_path):
-    """Apply professional styling to monthly employee report"""
-    try:
-        wb = load_workbook(file_path)
-        ws = wb.active
-
-        # Insert and style title row
-        ws.insert_rows(1)
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=ws.max_column)
-        title_cell = ws.cell(row=1, column=1)
-        title_cell.value = f"MSN GLOBAL IT SOLUTIONS - Monthly Employee Report ({get_month_year()})"
-        title_cell.font = Font(size=16, bold=True, color="FF0000", name="Calibri")
-        title_cell.fill = PatternFill("solid", fgColor="000000")  # Black background
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Define fills and fonts
-        header_fill = PatternFill("solid", fgColor="C80000")  # Red for headers
-        row_fill_1 = PatternFill("solid", fgColor="1C1C1C")   # Almost black
-        row_fill_2 = PatternFill("solid", fgColor="EDEDED")   # Light gray
-
-        border = Border(
-            left=Side(style='thin', color='000000'),
-            right=Side(style='thin', color='000000'),
-            top=Side(style='thin', color='000000'),
-            bottom=Side(style='thin', color='000000')
-        )
-
-        # Style column headers (now at row 3)
-        for col in range(1, ws.max_column + 1):
-            cell = ws.cell(row=3, column=col)
-            cell.fill = header_fill
-            cell.font = Font(bold=True, color="FFFFFF", name="Calibri")  # White bold text
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-
-        # Style body cells with alternating row colors (starting from row 4)
-        for i, row in enumerate(ws.iter_rows(min_row=4, max_row=ws.max_row, min_col=1, max_col=ws.max_column)):
-            fill = row_fill_1 if i % 2 == 0 else row_fill_2
-            font_color = "FFFFFF" if fill == row_fill_1 else "000000"
-            for cell in row:
-                cell.fill = fill
-                cell.font = Font(name="Calibri", color=font_color)
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = border
-
-        # Auto-adjust column widths
-        for col in ws.columns:
-            max_length = max(len(str(cell.value or "")) for cell in col)
-            ws.column_dimensions[get_column_letter(col[0].column)].width = max_length + 3
-
-        # Save styled workbook
-        wb.save(file_path)
-        
-    except Exception as e:
-        print(f"Error in style_monthly_excel: {e}")
-
-def create_styled_excel_report(df, filename):
-    """Create Excel report with professional styling"""
-    try:
-        # Save unstyled DataFrame
-        file_path = os.path.join(EXCEL_DIR, filename)
-        df.to_excel(file_path, index=False, sheet_name="Employee Report")
-        
-        # Apply styling based on filename
-        if 'Monthly_Employee_Report' in filename:
-            style_monthly_excel(file_path)
-        else:
-            style_excel(file_path)
-        
-        return file_path
-    except Exception as e:
-        print(f"Error creating styled Excel report: {e}")
-        return None
-
 # Login page
 def login_page():
     st.markdown("<h1 style='text-align: center; color: #8B0000;'>🔐 MSN GLOBAL IT SOLUTIONS</h1>", unsafe_allow_html=True)
@@ -929,6 +670,9 @@ def login_page():
 
 # Main dashboard
 def main_dashboard():
+    # Push channel from the face app (started once per server process)
+    recognition_listener = start_recognition_listener()
+    
     # Auto-update daily Excel
     auto_update_daily_excel()
     
@@ -1014,10 +758,15 @@ def main_dashboard():
         else:
             st.markdown("**🔴 Face Recognition:** Not Connected")
         
+        if recognition_listener.is_running:
+            st.markdown(f"**🟢 Push Channel:** Listening ({recognition_listener.connections} connected)")
+        else:
+            st.markdown("**🟡 Push Channel:** Off - polling event log")
+        
         # Face Recognition
         st.markdown("### 🔄 Face Recognition")
         
-        # Auto-refresh when JSON file changes
+        # Auto-refresh when the event log changes
         json_status = check_json_file_status()
         if json_status["exists"] and json_status["size"] > 0:
             # Auto-process face recognition data
@@ -1082,27 +831,20 @@ def main_dashboard():
         
         with control_col1:
             if st.button("📊 Generate Report", type="primary", use_container_width=True, key="gen_report"):
-                raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-                if os.path.exists(raw_file):
-                    try:
-                        df = pd.read_excel(raw_file)
-                        if not df.empty:
-                            actual_filename = generate_wide_excel(df, f'Attendance_Report_{get_month_year()}.xlsx')
-                            st.success("✅ Excel report generated and saved!")
-                        else:
-                            st.markdown("""
-                            <div style="background-color: #FF9800; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #F57C00;">
-                                <p style="margin: 0; color: white;">⚠ No data available for report</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    except Exception as e:
-                        st.error(f"❌ Error generating report: {str(e)}")
-                else:
-                    st.markdown("""
-                    <div style="background-color: #FF9800; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #F57C00;">
-                        <p style="margin: 0; color: white;">⚠ No attendance data available</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                try:
+                    df = load_month_attendance()
+                    if not df.empty:
+                        export_raw_excel()
+                        get_report_scheduler().rebuild(force=True)
+                        st.success("✅ Excel report generated and saved!")
+                    else:
+                        st.markdown("""
+                        <div style="background-color: #FF9800; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #F57C00;">
+                            <p style="margin: 0; color: white;">⚠ No data available for report</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+                except Exception as e:
+                    st.error(f"❌ Error generating report: {str(e)}")
 
         with control_col2:
             if st.button("📈 Monthly Report", type="secondary", use_container_width=True, key="monthly_report"):
@@ -1114,22 +856,16 @@ def main_dashboard():
         
         with control_col3:
             if st.button("🗑️ Clear Entries", type="secondary", use_container_width=True, key="clear_entries"):
-                raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
                 report_file = os.path.join(EXCEL_DIR, f'Attendance_Report_{get_month_year()}.xlsx')
                 monthly_file = os.path.join(EXCEL_DIR, f'Monthly_Employee_Report_{get_month_year()}.xlsx')
                 realtime_file = os.path.join(EXCEL_DIR, 'realtime_attendance.xlsx')
                 deleted_files = []
-                # Remove today's entries from raw file
-                if os.path.exists(raw_file):
-                    try:
-                        df = pd.read_excel(raw_file)
-                        today_date = get_today_date()
-                        # Remove today's entries
-                        df_filtered = df[df['Date'] != today_date]
-                        df_filtered.to_excel(raw_file, index=False)
-                        deleted_files.append(raw_file)
-                    except Exception as e:
-                        st.error(f"❌ Error clearing entries: {str(e)}")
+                # Remove today's entries from the store
+                try:
+                    if get_attendance_writer().delete_day(get_today_date()).result(timeout=10):
+                        deleted_files.append(ATTENDANCE_DB)
+                except Exception as e:
+                    st.error(f"❌ Error clearing entries: {str(e)}")
                 # Delete report files if they exist
                 for f in [report_file, monthly_file, realtime_file]:
                     if os.path.exists(f):
@@ -1149,84 +885,82 @@ def main_dashboard():
                     """, unsafe_allow_html=True)
         
         with control_col4:
+            with st.expander("📤 Export options"):
+                today = datetime.now().date()
+                export_range = st.date_input("Date range", value=(today, today), key="export_range")
+                export_employees = []
+                export_employee_df = load_employee_data()
+                if export_employee_df is not None and not export_employee_df.empty:
+                    export_options = [f"{row['Employee ID']} - {row['Name']}" for _, row in export_employee_df.iterrows()]
+                    export_employees = st.multiselect("Employees (all if empty)", export_options, key="export_employees")
+                export_format = st.radio("Format", available_formats(), horizontal=True, key="export_format")
             if st.button("📊 Export Data", type="secondary", use_container_width=True, key="export_data"):
-                raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-                if os.path.exists(raw_file):
-                    try:
-                        df = pd.read_excel(raw_file)
-                        today_df = df[df['Date'] == get_today_date()]
-                        if not today_df.empty:
-                            csv_data = today_df.to_csv(index=False)
-                            # Use a container to show download button
-                            download_container = st.container()
-                            with download_container:
-                                st.download_button(
-                                    label="📥 Download Today's CSV",
-                                    data=csv_data,
-                                    file_name=f"attendance_{get_today_date().replace('/', '_')}.csv",
-                                    mime="text/csv",
-                                    key="download_csv"
-                                )
-                        else:
-                            st.markdown("""
-                            <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
-                                <p style="margin: 0; color: white;">ℹ️ No data to export today</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    except Exception as e:
-                        st.error(f"❌ Error exporting data: {str(e)}")
-                else:
+                try:
+                    if isinstance(export_range, (tuple, list)):
+                        range_start = export_range[0]
+                        range_end = export_range[-1]
+                    else:
+                        range_start = range_end = export_range
+                    employee_ids = [e.split(" - ")[0] for e in export_employees]
+                    file_name = export_file_name(range_start, day_after(range_end), export_format)
+                    clean_exports(EXPORT_DIR)
+                    token = secrets.token_urlsafe(16)
+                    # Streamed to disk chunk by chunk from the archive partitions and the store
+                    parts = export_attendance(os.path.join(EXPORT_DIR, token, file_name), export_format,
+                                              get_attendance_store(), ARCHIVE_DIR, range_start, day_after(range_end),
+                                              employee_ids, max_part_bytes=EXPORT_PART_MB * 1024 * 1024)
+                    st.session_state.export_result = {'token': token, 'format': export_format, 'parts': parts}
+                except Exception as e:
+                    st.error(f"❌ Error exporting data: {str(e)}")
+            
+            export_result = st.session_state.get('export_result')
+            if export_result is not None:
+                parts = [(path, rows) for path, rows in export_result['parts'] if os.path.exists(path)]
+                total_rows = sum(rows for _, rows in parts)
+                if not total_rows:
                     st.markdown("""
                     <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
-                        <p style="margin: 0; color: white;">ℹ️ No data available for export</p>
+                        <p style="margin: 0; color: white;">ℹ️ No data to export for this range</p>
                     </div>
                     """, unsafe_allow_html=True)
+                elif st.get_option("server.enableStaticServing"):
+                    # Plain links: the browser downloads straight from disk, nothing is loaded into the dashboard
+                    links = []
+                    for path, rows in parts:
+                        name = os.path.basename(path)
+                        links.append(f'<a href="{EXPORT_URL_PREFIX}/{export_result["token"]}/{name}" download="{name}">📥 {name} ({rows} rows)</a>')
+                    st.markdown("<br>".join(links), unsafe_allow_html=True)
+                else:
+                    # Without static serving st.download_button holds the file in memory - offer one part at a time
+                    part_names = [os.path.basename(path) for path, _ in parts]
+                    selected_part = st.selectbox("Export part", part_names, key="export_part") if len(parts) > 1 else part_names[0]
+                    path, rows = parts[part_names.index(selected_part)]
+                    with open(path, 'rb') as export_file:
+                        st.download_button(
+                            label=f"📥 Download {rows} rows ({export_result['format'].upper()})",
+                            data=export_file,
+                            file_name=selected_part,
+                            mime=EXPORT_FORMATS[export_result['format']][1],
+                            key="download_csv"
+                        )
         
         # Status metrics
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            try:
-                df = pd.read_excel(raw_file)
-                today_count = len(df[df['Date'] == get_today_date()])
-                
-                # Calculate metrics for today
-                today_df = df[df['Date'] == get_today_date()]
-                present_count = len(today_df[today_df['Status'] == 'Present'])
-                late_count = len(today_df[today_df['Status'] == 'Late'])
-                absent_count = len(today_df[today_df['Status'] == 'Absent'])
-                
-                # Calculate total metrics (all time)
-                total_present = len(df[df['Status'] == 'Present'])
-                total_late = len(df[df['Status'] == 'Late'])
-                total_absent = len(df[df['Status'] == 'Absent'])
-                
-                # Calculate leave (assuming leave is marked as 'Leave' or 'Absent' for specific cases)
-                total_leave = len(df[df['Status'] == 'Leave']) if 'Leave' in df['Status'].values else 0
-                
-                # Display today's metrics
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("✅ Present Today", present_count)
-                with col2:
-                    st.metric("⏰ Late Today", late_count)
-                with col3:
-                    st.metric("❌ Absent Today", absent_count)
-                with col4:
-                    st.metric("📊 Total Entries", today_count)
-                
-            except Exception as e:
-                st.error(f"❌ Error loading metrics: {str(e)}")
-        else:
-            # Show zero metrics if no data
+        try:
+            status_counts = get_attendance_snapshot().today_counts
+            
+            # Display today's metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("✅ Present Today", 0)
+                st.metric("✅ Present Today", status_counts.get('Present', 0))
             with col2:
-                st.metric("⏰ Late Today", 0)
+                st.metric("⏰ Late Today", status_counts.get('Late', 0))
             with col3:
-                st.metric("❌ Absent Today", 0)
+                st.metric("❌ Absent Today", status_counts.get('Absent', 0))
             with col4:
-                st.metric("📊 Total Entries", 0)
+                st.metric("📊 Total Entries", sum(status_counts.values()))
+            
+        except Exception as e:
+            st.error(f"❌ Error loading metrics: {str(e)}")
         
         # Manual attendance
         st.markdown("### 👤 Manual Attendance")
@@ -1268,54 +1002,45 @@ def main_dashboard():
         # Attendance data with enhanced display
         st.markdown("### 📊 Today's Attendance")
         
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            try:
-                df = pd.read_excel(raw_file)
-                today_df = df[df['Date'] == get_today_date()]
+        try:
+            today_df = get_attendance_snapshot().today
+            
+            if not today_df.empty:
+                # Show enhanced information including time
+                if 'Entry_Time' in today_df.columns:
+                    # Format time for display - use .copy() to avoid SettingWithCopyWarning
+                    display_df = today_df[['Employee ID', 'Name', 'Status', 'Entry_Time']].copy()
+                    display_df['Entry_Time_Display'] = display_df['Entry_Time'].apply(
+                        lambda x: x.strftime('%H:%M') if hasattr(x, 'strftime') else str(x)
+                    )
+                    display_df = display_df[['Employee ID', 'Name', 'Status', 'Entry_Time_Display']]
+                    display_df.columns = ['Employee ID', 'Name', 'Status', 'Entry Time']
+                else:
+                    display_df = today_df[['Employee ID', 'Name', 'Status']].copy()
                 
-                if not today_df.empty:
-                    # Show enhanced information including time
-                    if 'Entry_Time' in today_df.columns:
-                        # Format time for display - use .copy() to avoid SettingWithCopyWarning
-                        display_df = today_df[['Employee ID', 'Name', 'Status', 'Entry_Time']].copy()
-                        display_df['Entry_Time_Display'] = display_df['Entry_Time'].apply(
-                            lambda x: x.strftime('%H:%M') if hasattr(x, 'strftime') else str(x)
-                        )
-                        display_df = display_df[['Employee ID', 'Name', 'Status', 'Entry_Time_Display']]
-                        display_df.columns = ['Employee ID', 'Name', 'Status', 'Entry Time']
+                # Add color coding to the dataframe
+                st.dataframe(display_df, use_container_width=True)
+                
+                # Show summary statistics
+                st.markdown("#### 📈 Attendance Summary")
+                status_counts = today_df['Status'].value_counts()
+                for status, count in status_counts.items():
+                    if status == 'Present':
+                        st.success(f"✅ {status}: {count} employee(s)")
+                    elif status == 'Late':
+                        st.warning(f"⏰ {status}: {count} employee(s)")
+                    elif status == 'Absent':
+                        st.error(f"❌ {status}: {count} employee(s)")
                     else:
-                        display_df = today_df[['Employee ID', 'Name', 'Status']].copy()
-                    
-                    # Add color coding to the dataframe
-                    st.dataframe(display_df, use_container_width=True)
-                    
-                    # Show summary statistics
-                    st.markdown("#### 📈 Attendance Summary")
-                    status_counts = today_df['Status'].value_counts()
-                    for status, count in status_counts.items():
-                        if status == 'Present':
-                            st.success(f"✅ {status}: {count} employee(s)")
-                        elif status == 'Late':
-                            st.warning(f"⏰ {status}: {count} employee(s)")
-                        elif status == 'Absent':
-                            st.error(f"❌ {status}: {count} employee(s)")
-                        else:
-                            st.info(f"📊 {status}: {count} employee(s)")
-                else:
-                    st.markdown("""
-                    <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
-                        <p style="margin: 0; color: white;">ℹ️ No attendance data for today</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            except Exception as e:
-                st.error(f"❌ Error loading attendance data: {str(e)}")
-        else:
-            st.markdown("""
-            <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
-                <p style="margin: 0; color: white;">ℹ️ No attendance data available</p>
-            </div>
-            """, unsafe_allow_html=True)
+                        st.info(f"📊 {status}: {count} employee(s)")
+            else:
+                st.markdown("""
+                <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
+                    <p style="margin: 0; color: white;">ℹ️ No attendance data for today</p>
+                </div>
+                """, unsafe_allow_html=True)
+        except Exception as e:
+            st.error(f"❌ Error loading attendance data: {str(e)}")
     
     with col2:
         # Empty column for balance
@@ -1349,15 +1074,15 @@ def continuous_face_monitoring():
         print(f"Error in continuous face monitoring: {e}")
 
 def monitor_face_recognition_file():
-    """Monitor the face recognition JSON file for changes and auto-refresh"""
+    """Monitor the face recognition event log for changes and auto-refresh"""
     try:
-        if os.path.exists(RECOGNIZED_ID_FILE):
-            # Check if file has been modified recently
-            file_stat = os.stat(RECOGNIZED_ID_FILE)
+        log_stat = get_recognition_log_stat()
+        if log_stat is not None:
+            # Check if the log has been appended to recently
             current_time = time.time()
             
-            # If file was modified in the last 3 seconds and we haven't checked recently
-            if (current_time - file_stat.st_mtime < 3 and 
+            # If log was modified in the last 3 seconds and we haven't checked recently
+            if (current_time - log_stat[1] < 3 and 
                 current_time - st.session_state.last_face_check > 2.0):
                 st.session_state.last_face_check = current_time
                 success, message = process_multiple_face_recognition()
@@ -1368,7 +1093,7 @@ def monitor_face_recognition_file():
                     time.sleep(0.1)
                     st.rerun()
         else:
-            # Keep monitoring even if no JSON file exists
+            # Keep monitoring even if no event log exists
             current_time = time.time()
             if current_time - st.session_state.last_face_check > 5:  # Check every 5 seconds
                 st.session_state.last_face_check = current_time
@@ -1377,395 +1102,148 @@ def monitor_face_recognition_file():
         print(f"Error monitoring face recognition file: {e}")
 
 def process_multiple_face_recognition():
-    """Process multiple face recognition IDs from JSON file"""
+    """Process multiple face recognition IDs from the event log"""
     try:
-        if not os.path.exists(RECOGNIZED_ID_FILE):
+        if get_recognition_log_stat() is None:
             return False, "No face recognition data available"
         
-        file_size = os.path.getsize(RECOGNIZED_ID_FILE)
-        
-        if file_size == 0:
-            return False, "No new detection data"
-        
-        # Read JSON content
-        try:
-            with open(RECOGNIZED_ID_FILE, 'r') as f:
-                data = json.load(f)
-        except Exception as e:
-            return False, f"Error reading JSON file: {str(e)}"
-        
-        # Handle both single entry and multiple entries
-        entries = []
-        if isinstance(data, list):
-            entries = data  # Multiple entries
-        else:
-            entries = [data]  # Single entry
-        
-        if not entries:
-            return False, "No valid entries found"
-        
-        # Process all entries (removed time filtering for now)
-        success_count = 0
-        messages = []
-        processed_ids = set()  # Track processed IDs to avoid duplicates
-        
-        for i, entry in enumerate(entries):
-            emp_id = entry.get('employee_id')
-            name = entry.get('name', '')
-            unique_id = entry.get('unique_id', '')
-            
-            if not emp_id:
-                continue
-            
-            if not unique_id:
-                continue
+        reader = get_recognition_reader()
+        # Held until the checkpoint is committed so two sessions never process the same events
+        with reader.lock:
+            if reader.pending_bytes() == 0:
+                return False, "No new detection data"
             
-            # Skip if already processed this unique ID
-            if unique_id in processed_ids:
-                continue
+            # Only events appended since the last committed checkpoint
+            try:
+                entries = reader.poll()
+            except Exception as e:
+                return False, f"Error reading event log: {str(e)}"
             
-            processed_ids.add(unique_id)
+            if not entries:
+                reader.commit()
+                return False, "No valid entries found"
             
-            # Check for duplicate before processing
-            if is_duplicate_attendance_streamlit(emp_id):
-                messages.append(f"⚠️ {emp_id}: Already marked today")
-                continue
+            # Process every entry in order; the checkpoint only moves past handled events
+            success_count = 0
+            messages = []
+            processed_ids = set()  # Track processed IDs to avoid duplicates
+            handled = 0
             
-            if not name:
-                # Try to get name from employee CSV data
-                try:
-                    employee_df = load_employee_data()
-                    if employee_df is not None and not employee_df.empty:
-                        emp_row = employee_df[employee_df['Employee ID'] == emp_id]
-                        if not emp_row.empty:
-                            name = emp_row['Name'].iloc[0]
-                except Exception as e:
-                    name = f"Employee {emp_id}"
+            for i, entry in enumerate(entries):
+                emp_id = entry.get('employee_id')
+                name = entry.get('name', '')
+                unique_id = entry.get('unique_id', '')
+                
+                if not emp_id or not unique_id or unique_id in processed_ids:
+                    handled = i + 1
+                    continue
+                
+                # Marks use the recognition time, so a backlog replayed later lands on the right day
+                event_time = event_datetime(entry)
+                
+                # Check for duplicate before processing (the presence index only covers today)
+                if event_time.strftime("%d/%m/%Y") == get_today_date() and is_duplicate_attendance_streamlit(emp_id):
+                    processed_ids.add(unique_id)
+                    handled = i + 1
+                    messages.append(f"⚠️ {emp_id}: Already marked today")
+                    continue
+                
+                if not name:
+                    # Try to get name from employee CSV data
+                    try:
+                        employee_df = load_employee_data()
+                        if employee_df is not None and not employee_df.empty:
+                            emp_row = employee_df[employee_df['Employee ID'] == emp_id]
+                            if not emp_row.empty:
+                                name = emp_row['Name'].iloc[0]
+                    except Exception as e:
+                        name = f"Employee {emp_id}"
+                
+                outcome, message = mark_attendance_at(emp_id, name or f"Employee {emp_id}", event_time)
+                
+                if outcome == MARK_FAILED:
+                    # Transient failure: stop here and retry this event on the next poll
+                    messages.append(f"❌ {emp_id}: {message}")
+                    break
+                
+                processed_ids.add(unique_id)
+                handled = i + 1
+                if outcome == MARK_SAVED:
+                    success_count += 1
+                    messages.append(f"✅ {name or emp_id} ({emp_id})")
+                else:
+                    messages.append(f"⚠️ {emp_id}: {message}")
             
-            success, message = mark_attendance(emp_id, name or f"Employee {emp_id}")
+            # Advance the checkpoint past the events handled in this batch only
+            reader.commit(handled)
             
-            if success:
-                success_count += 1
-                messages.append(f"✅ {name or emp_id} ({emp_id})")
+            if success_count > 0:
+                result_message = f"✅ Face Recognition: {success_count} attendance(s) marked - {', '.join(messages)}"
+                print(f"🎉 Success: {result_message}")
+                return True, result_message
             else:
-                messages.append(f"❌ {emp_id}: {message}")
-        
-        # Clear the JSON file after processing all entries
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-        except Exception as e:
-            print(f"⚠️ Error clearing JSON file: {e}")
-        
-        if success_count > 0:
-            result_message = f"✅ Face Recognition: {success_count} attendance(s) marked - {', '.join(messages)}"
-            print(f"🎉 Success: {result_message}")
-            return True, result_message
-        else:
-            result_message = f"No new attendance marked - {', '.join(messages)}"
-            print(f"ℹ️ No success: {result_message}")
-            return False, result_message
-            
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON decode error: {e}")
-        # Clear corrupted JSON file
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-            print("🗑️ Cleared corrupted JSON file")
-        except:
-            pass
-        return False, "Cleared corrupted data"
+                result_message = f"No new attendance marked - {', '.join(messages)}"
+                print(f"ℹ️ No success: {result_message}")
+                return False, result_message
+                
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         return False, f"Error processing data: {str(e)}"
     
     return False, None
 
-def process_multiple_face_recognition_enhanced():
-    """Enhanced version with detailed feedback and better duplicate prevention"""
-    try:
-        if not os.path.exists(RECOGNIZED_ID_FILE):
-            return False, "ℹ️ No JSON file found - Face recognition app may not be running", None
-        
-        file_size = os.path.getsize(RECOGNIZED_ID_FILE)
-        if file_size == 0:
-            return False, "ℹ️ JSON file is empty - No new detection data", None
-        
-        # Read JSON content
-        with open(RECOGNIZED_ID_FILE, 'r') as f:
-            data = json.load(f)
-        
-        # Handle both single entry and multiple entries
-        entries = []
-        if isinstance(data, list):
-            entries = data  # Multiple entries
-        else:
-            entries = [data]  # Single entry
-        
-        if not entries:
-            return False, "❌ No valid entries found in JSON", None
-        
-        # Filter entries to only process recent ones (within last 30 seconds)
-        current_time = datetime.now()
-        recent_entries = []
-        for entry in entries:
-            try:
-                timestamp_str = entry.get('timestamp', '')
-                if timestamp_str:
-                    entry_time = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    time_diff = (current_time - entry_time).total_seconds()
-                    if time_diff < 30:  # Only process entries from last 30 seconds
-                        recent_entries.append(entry)
-                    else:
-                        print(f"⏰ Skipping old entry for {entry.get('employee_id', 'Unknown')} (age: {time_diff:.1f}s)")
-            except Exception as e:
-                print(f"❌ Error parsing timestamp: {e}")
-                continue
-        
-        if not recent_entries:
-            return False, "❌ No recent entries found in JSON", None
-        
-        entries = recent_entries  # Use only recent entries
-        
-        # Processing details for feedback
-        processing_details = {
-            "total_entries": len(entries),
-            "processed_ids": set(),
-            "duplicate_entries": [],
-            "successful_entries": [],
-            "failed_entries": [],
-            "skipped_entries": []
-        }
-        
-        success_count = 0
-        messages = []
-        
-        for i, entry in enumerate(entries):
-            emp_id = entry.get('employee_id')
-            name = entry.get('name', '')
-            unique_id = entry.get('unique_id', '')
-            timestamp = entry.get('timestamp', '')
-            
-            # Validate entry
-            if not emp_id or not unique_id:
-                processing_details["skipped_entries"].append(f"Entry {i+1}: Missing employee_id or unique_id")
-                continue
-            
-            # Check for duplicate unique_id
-            if unique_id in processing_details["processed_ids"]:
-                processing_details["duplicate_entries"].append(f"{emp_id} (unique_id: {unique_id})")
-                continue
-            
-            processing_details["processed_ids"].add(unique_id)
-            
-            # Check for duplicate attendance (same employee, same day)
-            if is_duplicate_attendance_streamlit(emp_id):
-                processing_details["skipped_entries"].append(f"{emp_id}: Already marked attendance today")
-                messages.append(f"⚠️ {emp_id}: Already marked today")
-                continue
-            
-            # Get employee name if not provided
-            if not name:
-                try:
-                    employee_df = load_employee_data()
-                    if employee_df is not None and not employee_df.empty:
-                        emp_row = employee_df[employee_df['Employee ID'] == emp_id]
-                        if not emp_row.empty:
-                            name = emp_row['Name'].iloc[0]
-                except Exception as e:
-                    print(f"Error getting employee name from CSV: {e}")
-                    name = f"Employee {emp_id}"
-            
-            # Mark attendance
-            success, message = mark_attendance(emp_id, name or f"Employee {emp_id}")
-            if success:
-                success_count += 1
-                processing_details["successful_entries"].append({
-                    "employee_id": emp_id,
-                    "name": name or f"Employee {emp_id}",
-                    "timestamp": timestamp,
-                    "unique_id": unique_id
-                })
-                messages.append(f"✅ {name or emp_id} ({emp_id})")
-            else:
-                processing_details["failed_entries"].append({
-                    "employee_id": emp_id,
-                    "error": message
-                })
-                messages.append(f"❌ {emp_id}: {message}")
-        
-        # Clear the JSON file after processing
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-        except:
-            pass
-        
-        # Prepare detailed feedback
-        details = {
-            "📊 Processing Summary": {
-                "Total entries found": processing_details["total_entries"],
-                "Unique entries processed": len(processing_details["processed_ids"]),
-                "Successful attendance marks": len(processing_details["successful_entries"]),
-                "Failed attempts": len(processing_details["failed_entries"]),
-                "Skipped entries": len(processing_details["skipped_entries"]),
-                "Duplicate entries": len(processing_details["duplicate_entries"])
-            }
-        }
-        
-        if processing_details["successful_entries"]:
-            details["✅ Successful Entries"] = processing_details["successful_entries"]
-        
-        if processing_details["failed_entries"]:
-            details["❌ Failed Entries"] = processing_details["failed_entries"]
-        
-        if processing_details["skipped_entries"]:
-            details["⚠️ Skipped Entries"] = processing_details["skipped_entries"]
-        
-        if processing_details["duplicate_entries"]:
-            details["🔄 Duplicate Entries"] = processing_details["duplicate_entries"]
-        
-        if success_count > 0:
-            return True, f"✅ Face Recognition: {success_count} attendance(s) marked successfully", details
-        else:
-            return False, f"ℹ️ No new attendance marked - {', '.join(messages)}", details
-            
-    except json.JSONDecodeError:
-        # Clear corrupted JSON file
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-        except:
-            pass
-        return False, "❌ Corrupted JSON data - File cleared", {"❌ Error": "JSON file was corrupted and has been cleared"}
-    except Exception as e:
-        print(f"Error reading face recognition JSON: {e}")
-        return False, f"❌ Error processing JSON: {str(e)}", {"❌ Error": str(e)}
-
 def check_json_file_status():
-    """Check the status of the JSON file and return detailed information"""
+    """Check the status of the recognition event log and return detailed information"""
     try:
-        if not os.path.exists(RECOGNIZED_ID_FILE):
+        log_stat = get_recognition_log_stat()
+        if log_stat is None:
             return {
                 "exists": False,
                 "size": 0,
                 "content": None,
-                "status": "File not found"
+                "status": "Event log not found"
             }
         
-        file_size = os.path.getsize(RECOGNIZED_ID_FILE)
+        # Bytes appended since the dashboard's checkpoint - zero means nothing new to ingest
+        file_size = get_recognition_reader().pending_bytes()
         if file_size == 0:
             return {
                 "exists": True,
                 "size": 0,
                 "content": None,
-                "status": "File is empty"
+                "status": "No new events"
             }
         
-        # Try to read the JSON content
-        try:
-            with open(RECOGNIZED_ID_FILE, 'r') as f:
-                content = json.load(f)
-            return {
-                "exists": True,
-                "size": file_size,
-                "content": content,
-                "status": "File contains valid JSON"
-            }
-        except json.JSONDecodeError:
-            return {
-                "exists": True,
-                "size": file_size,
-                "content": None,
-                "status": "File contains invalid JSON"
-            }
-        except Exception as e:
-            return {
-                "exists": True,
-                "size": file_size,
-                "content": None,
-                "status": f"Error reading file: {str(e)}"
-            }
+        # Size is enough to know there is pending data; events are parsed only when processed
+        return {
+            "exists": True,
+            "size": file_size,
+            "content": None,
+            "status": "Event log contains data"
+        }
             
     except Exception as e:
         return {
             "exists": False,
             "size": 0,
             "content": None,
-            "status": f"Error checking file: {str(e)}"
+            "status": f"Error checking event log: {str(e)}"
         }
 
 def is_duplicate_attendance_streamlit(emp_id):
-    """Enhanced duplicate check - Check if this specific employee already marked attendance today"""
-    today_date = get_today_date()
-    
-    # Check multiple data sources for duplicates
-    sources_checked = []
-    
-    # 1. Check Excel file (primary source)
+    """Check if this specific employee already marked attendance today - constant-time presence index lookup"""
     try:
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            df = pd.read_excel(raw_file)
-            if not df.empty and 'Date' in df.columns and 'Employee ID' in df.columns:
-                today_entries = df[df['Date'] == today_date]
-                this_employee_entries = today_entries[today_entries['Employee ID'] == emp_id]
-                if len(this_employee_entries) > 0:
-                    sources_checked.append(f"Excel: {len(this_employee_entries)} entry(ies) found")
-                    return True
-                else:
-                    sources_checked.append("Excel: No entries found")
-            else:
-                sources_checked.append("Excel: Invalid data structure")
+        return get_presence_index().contains(emp_id)
     except Exception as e:
-        sources_checked.append(f"Excel: Error - {str(e)}")
-    
-    # 2. Check CSV file (backup source)
-    try:
-        csv_file = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared', 'attendance_log.csv')
-        if os.path.exists(csv_file):
-            df = pd.read_csv(csv_file, on_bad_lines='skip', engine='python')
-            if not df.empty and 'Date' in df.columns and 'Employee ID' in df.columns:
-                today_entries = df[df['Date'] == today_date]
-                this_employee_entries = today_entries[today_entries['Employee ID'] == emp_id]
-                if len(this_employee_entries) > 0:
-                    sources_checked.append(f"CSV: {len(this_employee_entries)} entry(ies) found")
-                    return True
-                else:
-                    sources_checked.append("CSV: No entries found")
-            else:
-                sources_checked.append("CSV: Invalid data structure")
-    except Exception as e:
-        sources_checked.append(f"CSV: Error - {str(e)}")
-    
-    # 3. Check for any other attendance files in the system
-    try:
-        # Check if there are any other attendance files for today
-        attendance_files = []
-        for file in os.listdir(EXCEL_DIR):
-            if file.startswith('Attendance_') and file.endswith('.xlsx'):
-                attendance_files.append(file)
-        
-        for file in attendance_files:
-            try:
-                file_path = os.path.join(EXCEL_DIR, file)
-                df = pd.read_excel(file_path)
-                if not df.empty and 'Date' in df.columns and 'Employee ID' in df.columns:
-                    today_entries = df[df['Date'] == today_date]
-                    this_employee_entries = today_entries[today_entries['Employee ID'] == emp_id]
-                    if len(this_employee_entries) > 0:
-                        sources_checked.append(f"{file}: {len(this_employee_entries)} entry(ies) found")
-                        return True
-            except Exception as e:
-                sources_checked.append(f"{file}: Error - {str(e)}")
-    except Exception as e:
-        sources_checked.append(f"File scan: Error - {str(e)}")
-    
-    return False  # This employee hasn't marked attendance today
+        print(f"Error checking duplicate attendance: {e}")
+        return False
 
 def get_last_sync_time():
-    """Get the last sync time from the JSON file"""
+    """Get the last sync time from the event log"""
     try:
-        if os.path.exists(RECOGNIZED_ID_FILE):
-            file_stat = os.stat(RECOGNIZED_ID_FILE)
-            last_modified = datetime.fromtimestamp(file_stat.st_mtime)
+        log_stat = get_recognition_log_stat()
+        if log_stat is not None:
+            last_modified = datetime.fromtimestamp(log_stat[1])
             return last_modified.strftime('%H:%M:%S')
         return "Never"
     except Exception as e:
@@ -1774,13 +1252,13 @@ def get_last_sync_time():
 def get_sync_status():
     """Get detailed sync status"""
     try:
-        if os.path.exists(RECOGNIZED_ID_FILE):
-            file_stat = os.stat(RECOGNIZED_ID_FILE)
+        log_stat = get_recognition_log_stat()
+        if log_stat is not None:
             current_time = time.time()
             
-            if current_time - file_stat.st_mtime < 60:  # Within last minute
+            if current_time - log_stat[1] < 60:  # Within last minute
                 return "🟢 Active - Recently updated"
-            elif current_time - file_stat.st_mtime < 300:  # Within last 5 minutes
+            elif current_time - log_stat[1] < 300:  # Within last 5 minutes
                 return "🟡 Active - Updated recently"
             else:
                 return "🟡 Active - Ready for detection"
@@ -1795,17 +1273,13 @@ def get_today_attendance_summary():
     summary = {'present': 0, 'late': 0, 'absent': 0, 'total': 0}
     
     try:
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            df = pd.read_excel(raw_file)
-            if not df.empty and 'Date' in df.columns and 'Status' in df.columns:
-                today_entries = df[df['Date'] == today_date]
-                if not today_entries.empty:
-                    summary['present'] = len(today_entries[today_entries['Status'] == 'Present'])
-                    summary['late'] = len(today_entries[today_entries['Status'] == 'Late'])
-                    summary['absent'] = len(today_entries[today_entries['Status'] == 'Absent'])
-                    summary['total'] = len(today_entries)
-                    return summary
+        status_counts = get_attendance_snapshot().today_counts
+        if status_counts:
+            summary['present'] = status_counts.get('Present', 0)
+            summary['late'] = status_counts.get('Late', 0)
+            summary['absent'] = status_counts.get('Absent', 0)
+            summary['total'] = sum(status_counts.values())
+            return summary
     except Exception as e:
         print(f"Error getting attendance summary: {e}")
     
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Headless batch report generation.
+
+Builds the wide Attendance_Report and the Monthly_Employee_Report for every
+month in a range and every site data directory, in a process pool:
+
+    python generate_reports.py --from 2026-01 --to 2026-10 --data-dir . --data-dir /srv/site2
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.report_jobs import (load_site_month, load_site_roster, month_label, site_paths,
+                                 write_monthly_employee_report, write_wide_report)
+
+REPORT_KINDS = ('wide', 'monthly')
+
+
+def parse_month(value):
+    try:
+        parsed = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {value!r}")
+    return parsed.year, parsed.month
+
+
+def month_range(start, end):
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def site_out_dirs(data_dirs, out_dir=None):
+    """
+    Output directory per site: its own excels/ by default; with ``out_dir``
+    one subdirectory per site, so sites never write the same report path.
+    """
+    if not out_dir:
+        return {data_dir: site_paths(data_dir)[1] for data_dir in data_dirs}
+    dirs, used = {}, set()
+    for data_dir in data_dirs:
+        base = os.path.basename(os.path.normpath(os.path.abspath(data_dir))) or 'site'
+        name, n = base, 2
+        while name in used:
+            name, n = f"{base}_{n}", n + 1
+        used.add(name)
+        dirs[data_dir] = os.path.join(out_dir, name)
+    return dirs
+
+
+def run_job(data_dir, year, month, kinds, out_dir):
+    """Build the reports for one site and month; returns a result dict (never raises)."""
+    started = time.perf_counter()
+    result = {'site': data_dir, 'month': month_label(year, month), 'rows': 0, 'files': [], 'error': None}
+    try:
+        df = load_site_month(data_dir, year, month)
+        result['rows'] = len(df)
+        if not df.empty:
+            os.makedirs(out_dir, exist_ok=True)
+            label = month_label(year, month)
+            if 'wide' in kinds:
+                result['files'].append(write_wide_report(df, os.path.join(out_dir, f'Attendance_Report_{label}.xlsx')))
+            if 'monthly' in kinds:
+                roster = load_site_roster(data_dir, df)
+                path = os.path.join(out_dir, f'Monthly_Employee_Report_{label}.xlsx')
+                result['files'].append(write_monthly_employee_report(df, roster, path, label))
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate attendance reports for a range of months and sites")
+    parser.add_argument('--from', dest='start', type=parse_month, required=True, help="first month, YYYY-MM")
+    parser.add_argument('--to', dest='end', type=parse_month, help="last month, YYYY-MM (default: --from)")
+    parser.add_argument('--data-dir', action='append', required=True,
+                        help="site directory with data/attendance.db and excels/ (repeatable)")
+    parser.add_argument('--reports', nargs='+', choices=REPORT_KINDS, default=list(REPORT_KINDS))
+    parser.add_argument('--out-dir', help="write reports to <out-dir>/<site folder name>/ instead of each site's excels/")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    end = args.end or args.start
+    if end < args.start:
+        parser.error("--to is before --from")
+    data_dirs = list(dict.fromkeys(args.data_dir))
+    out_dirs = site_out_dirs(data_dirs, args.out_dir)
+    jobs = [(data_dir, year, month) for data_dir in data_dirs for year, month in month_range(args.start, end)]
+    print(f"🚀 {len(jobs)} job(s) on {args.workers} worker(s)")
+
+    started = time.perf_counter()
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [pool.submit(run_job, data_dir, year, month, args.reports, out_dirs[data_dir])
+                   for data_dir, year, month in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            if result['error']:
+                failures += 1
+                print(f"❌ {result['site']} {result['month']}: {result['error']} ({result['seconds']:.2f}s)")
+            elif not result['files']:
+                print(f"ℹ️ {result['site']} {result['month']}: no attendance data ({result['seconds']:.2f}s)")
+            else:
+                names = ', '.join(os.path.basename(f) for f in result['files'])
+                print(f"✅ {result['site']} {result['month']}: {result['rows']} rows -> {names} ({result['seconds']:.2f}s)")
+    print(f"⏱️ Finished in {time.perf_counter() - started:.2f}s, {failures} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
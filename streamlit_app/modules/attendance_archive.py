@@ -0,0 +1,271 @@
+import argparse
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+from modules.attendance_store import AttendanceStore, RAW_COLUMNS, DISPLAY_DATE_FORMAT, month_bounds, to_iso_date, to_time_text
+
+# pyarrow is optional - the live dashboard only needs the SQLite store
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Attendance history as Hive-style date partitions, one file per month:
+#   archive/year=2026/month=10/attendance.parquet
+PARTITION_FILE = "attendance.parquet"
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for the attendance archive (pip install pyarrow)")
+
+
+def archive_schema():
+    _require_pyarrow()
+    return pa.schema([
+        ('date', pa.date32()),
+        ('employee_id', pa.dictionary(pa.int32(), pa.string())),
+        ('name', pa.dictionary(pa.int32(), pa.string())),
+        ('entry_minutes', pa.int16()),      # minutes after midnight, null if unknown
+        ('status', pa.dictionary(pa.int8(), pa.string())),
+    ])
+
+
+def _entry_minutes(value):
+    text = to_time_text(value)
+    if not text:
+        return None
+    try:
+        parts = text.split(':')
+        return int(parts[0]) * 60 + int(parts[1])
+    except (ValueError, IndexError):
+        return None
+
+
+def normalize_records(df):
+    """
+    Convert a frame in the raw layout (Employee ID, Name, Date, Entry_Time,
+    Status) into the archive's compact columns, dropping rows without an
+    employee or date and keeping the first mark per employee per day.
+    """
+    df = df.dropna(subset=['Employee ID', 'Date'])
+    out = pd.DataFrame({
+        'date': pd.to_datetime(df['Date'].map(to_iso_date), format='%Y-%m-%d').dt.date,
+        'employee_id': df['Employee ID'].astype(str),
+        'name': df['Name'].astype(str) if 'Name' in df.columns else '',
+        'entry_minutes': (df['Entry_Time'].map(_entry_minutes) if 'Entry_Time' in df.columns else None),
+        'status': df['Status'].astype(str) if 'Status' in df.columns else '',
+    })
+    out['entry_minutes'] = out['entry_minutes'].astype('Int16')
+    out = out.drop_duplicates(subset=['date', 'employee_id'], keep='first')
+    return out.sort_values(['date', 'employee_id'], kind='stable').reset_index(drop=True)
+
+
+def partition_path(archive_dir, year, month):
+    return os.path.join(archive_dir, f"year={year}", f"month={month:02d}", PARTITION_FILE)
+
+
+def _table_from_frame(df):
+    return pa.Table.from_pandas(df, schema=archive_schema(), preserve_index=False)
+
+
+def write_month(archive_dir, year, month, df, merge=True):
+    """
+    Write one month's partition (compact frame from ``normalize_records``).
+    With ``merge`` the existing partition is combined with ``df`` (existing
+    rows win on the same date + employee). Written via tmp + rename.
+    """
+    _require_pyarrow()
+    path = partition_path(archive_dir, year, month)
+    if merge and os.path.exists(path):
+        existing = pq.read_table(path).to_pandas()
+        for col in ('employee_id', 'name', 'status'):
+            existing[col] = existing[col].astype(str)
+        existing['entry_minutes'] = existing['entry_minutes'].astype('Int16')
+        df = pd.concat([existing, df], ignore_index=True)
+        df = df.drop_duplicates(subset=['date', 'employee_id'], keep='first')
+        df = df.sort_values(['date', 'employee_id'], kind='stable').reset_index(drop=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Dot-prefixed so a concurrent dataset scan ignores the half-written file
+    tmp_path = os.path.join(os.path.dirname(path), '.' + PARTITION_FILE + '.tmp')
+    # Small row groups sorted by date keep min/max statistics useful for day-range predicates
+    pq.write_table(_table_from_frame(df), tmp_path, row_group_size=4096, compression='zstd')
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_records(archive_dir, df, merge=True):
+    """Split a raw-layout frame by month and write each partition; returns the paths written."""
+    compact = normalize_records(df)
+    if compact.empty:
+        return []
+    months = pd.to_datetime(compact['date'])
+    written = []
+    for (year, month), part in compact.groupby([months.dt.year, months.dt.month]):
+        written.append(write_month(archive_dir, int(year), int(month), part.reset_index(drop=True), merge=merge))
+    return written
+
+
+def import_raw_workbooks(excel_dir, archive_dir):
+    """
+    One-shot importer: archive every Attendance_Raw_<Month>.xlsx in
+    ``excel_dir``. Safe to re-run - rows already archived are kept as is.
+    Returns the number of workbooks imported.
+    """
+    _require_pyarrow()
+    imported = 0
+    for fname in sorted(os.listdir(excel_dir)):
+        if not (fname.startswith('Attendance_Raw_') and fname.endswith('.xlsx')):
+            continue
+        try:
+            write_records(archive_dir, pd.read_excel(os.path.join(excel_dir, fname)))
+            imported += 1
+            print(f"📦 Archived {fname}")
+        except Exception as e:
+            print(f"❌ Error archiving {fname}: {e}")
+    return imported
+
+
+def closed_months(store, keep_months=2, today=None):
+    """(year, month) of every month in the store older than the last ``keep_months`` months."""
+    first = store.first_date()
+    if first is None:
+        return []
+    today = today or date.today()
+    # First day of the oldest month that stays live in the store
+    keep_index = today.year * 12 + today.month - 1 - (keep_months - 1)
+    first = date.fromisoformat(first)
+    return [(index // 12, index % 12 + 1) for index in range(first.year * 12 + first.month - 1, keep_index)]
+
+
+def archive_closed_months(store, archive_dir, keep_months=2, today=None):
+    """
+    Move closed months from the store into the archive, one month at a
+    time: the partition is written (merged with anything already archived)
+    before that month's rows are deleted from the store. The current month
+    and the ``keep_months - 1`` before it stay in the store.
+    Returns a list of (year, month, rows) moved.
+    """
+    _require_pyarrow()
+    moved = []
+    for year, month in closed_months(store, keep_months, today):
+        start, end = month_bounds(year, month)
+        df = store.records(start, end)
+        if df.empty:
+            continue
+        write_month(archive_dir, year, month, normalize_records(df))
+        store.delete_range(start, end)
+        moved.append((year, month, len(df)))
+    return moved
+
+
+def build_filter(start=None, end=None, employee_ids=None, statuses=None):
+    """
+    Arrow filter expression for a query. Year/month terms prune partitions
+    (whole directories are skipped); date, employee and status terms are
+    checked against row group statistics before any data is decoded.
+    """
+    _require_pyarrow()
+    expr = None
+
+    def _and(term):
+        nonlocal expr
+        expr = term if expr is None else expr & term
+
+    if start is not None:
+        start = date.fromisoformat(to_iso_date(start))
+        _and((ds.field('year') > start.year) | ((ds.field('year') == start.year) & (ds.field('month') >= start.month)))
+        _and(ds.field('date') >= pa.scalar(start, pa.date32()))
+    if end is not None:
+        end = date.fromisoformat(to_iso_date(end))
+        _and((ds.field('year') < end.year) | ((ds.field('year') == end.year) & (ds.field('month') <= end.month)))
+        _and(ds.field('date') < pa.scalar(end, pa.date32()))
+    if employee_ids:
+        _and(ds.field('employee_id').isin([str(e) for e in employee_ids]))
+    if statuses:
+        _and(ds.field('status').isin(list(statuses)))
+    return expr
+
+
+def open_archive(archive_dir):
+    _require_pyarrow()
+    return ds.dataset(archive_dir, format='parquet', partitioning='hive')
+
+
+def scan_archive(archive_dir, start=None, end=None, employee_ids=None, statuses=None, columns=None, batch_size=65536):
+    """
+    Yield pyarrow RecordBatches matching the query, reading only the
+    partitions, row groups and ``columns`` it needs.
+    """
+    if not os.path.isdir(archive_dir):
+        return
+    dataset = open_archive(archive_dir)
+    scanner = dataset.scanner(columns=columns, filter=build_filter(start, end, employee_ids, statuses),
+                              batch_size=batch_size)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch
+
+
+def read_archive(archive_dir, start=None, end=None, employee_ids=None, statuses=None, columns=None):
+    """Query the archive into a compact DataFrame (see ``scan_archive``)."""
+    _require_pyarrow()
+    columns = columns or ['date', 'employee_id', 'name', 'entry_minutes', 'status']
+    batches = list(scan_archive(archive_dir, start, end, employee_ids, statuses, columns))
+    if not batches:
+        return pd.DataFrame(columns=columns)
+    return pa.Table.from_batches(batches).to_pandas()
+
+
+def to_raw_layout(df):
+    """Convert a compact archive frame back to the dashboard's raw layout."""
+    # Format each distinct date and entry time once - a month has ~31 dates and a few hundred times
+    dates = df['date'].map({d: d.strftime(DISPLAY_DATE_FORMAT) for d in df['date'].unique()})
+    minutes = df['entry_minutes']
+    entry_time = minutes.map({m: f"{int(m) // 60:02d}:{int(m) % 60:02d}" for m in minutes.dropna().unique()})
+    raw = pd.DataFrame({
+        'Employee ID': df['employee_id'].astype(str),
+        'Name': df['name'].astype(str),
+        'Date': dates,
+        'Entry_Time': entry_time.astype(object).where(minutes.notna(), None),
+        'Status': df['status'].astype(str),
+    })
+    return raw[RAW_COLUMNS]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Attendance Parquet archive")
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_cmd = commands.add_parser('import', help="one-shot import of Attendance_Raw_<Month>.xlsx workbooks")
+    import_cmd.add_argument('excel_dir')
+    import_cmd.add_argument('archive_dir')
+    archive_cmd = commands.add_parser('archive', help="move closed months from the store into the archive")
+    archive_cmd.add_argument('db_path', help="the dashboard's data/attendance.db")
+    archive_cmd.add_argument('archive_dir', help="usually data/archive next to the database")
+    archive_cmd.add_argument('--keep-months', type=int, default=2,
+                             help="months kept in the store, including the current one (default: 2)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        count = import_raw_workbooks(args.excel_dir, args.archive_dir)
+        print(f"✅ Imported {count} workbook(s) into {args.archive_dir}")
+        return 0
+    if args.keep_months < 1:
+        parser.error("--keep-months must be at least 1")
+    moved = archive_closed_months(AttendanceStore(args.db_path), args.archive_dir, args.keep_months)
+    for year, month, rows in moved:
+        print(f"📦 Archived {year}-{month:02d}: {rows} rows")
+    print(f"✅ Moved {len(moved)} month(s) into {args.archive_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    # python -m modules.attendance_archive import <excel_dir> <archive_dir>
+    # python -m modules.attendance_archive archive data/attendance.db data/archive
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import os
+import time
+
+import pandas as pd
+
+from modules.attendance_store import RAW_COLUMNS, to_iso_date
+from modules.attendance_archive import PYARROW_AVAILABLE, scan_archive, to_raw_layout
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+# format -> (file extension, mime type)
+EXPORT_FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+}
+CHUNK_ROWS = 50000
+
+
+def available_formats():
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or PYARROW_AVAILABLE]
+
+
+def export_file_name(start, end, fmt):
+    """e.g. attendance_2026-01-01_2026-10-18.csv (``end`` is exclusive, the name shows the last day)."""
+    first = to_iso_date(start)
+    last = (pd.Timestamp(to_iso_date(end)) - pd.Timedelta(days=1)).date().isoformat()
+    span = first if first == last else f"{first}_{last}"
+    return f"attendance_{span}{EXPORT_FORMATS[fmt][0]}"
+
+
+def iter_export_chunks(store=None, archive_dir=None, start=None, end=None, employee_ids=None, statuses=None,
+                       chunk_rows=CHUNK_ROWS):
+    """
+    Yield raw-layout DataFrames for ``start <= date < end``, oldest first.
+
+    Days before the store's first mark come from the Parquet archive (only
+    the partitions and row groups the filter needs are read); the rest comes
+    from the store through a cursor. The two never overlap, so a month that
+    was archived but is still in the store is exported once.
+    """
+    store_from = store.first_date() if store is not None else None
+    if archive_dir and PYARROW_AVAILABLE and os.path.isdir(archive_dir):
+        archive_end = end
+        if store_from is not None and (end is None or store_from < to_iso_date(end)):
+            archive_end = store_from
+        if start is None or archive_end is None or to_iso_date(start) < to_iso_date(archive_end):
+            for batch in scan_archive(archive_dir, start, archive_end, employee_ids, statuses,
+                                      batch_size=chunk_rows):
+                yield to_raw_layout(batch.to_pandas())
+    if store_from is not None:
+        store_start = start
+        if start is None or to_iso_date(start) < store_from:
+            store_start = store_from
+        yield from store.iter_records(store_start, end, employee_ids, statuses, chunk_rows=chunk_rows)
+
+
+def _raw_parquet_schema():
+    return pa.schema([(column, pa.string()) for column in RAW_COLUMNS])
+
+
+class _ExportPart:
+    """One output file, written chunk by chunk to a temporary name."""
+
+    def __init__(self, tmp_path, fmt):
+        self.tmp_path = tmp_path
+        self.fmt = fmt
+        self.rows = 0
+        if fmt == 'csv':
+            self.file = open(tmp_path, 'w', newline='', encoding='utf-8')
+            self.file.write(','.join(RAW_COLUMNS) + '\n')
+        else:
+            self.schema = _raw_parquet_schema()
+            self.writer = pq.ParquetWriter(tmp_path, self.schema, compression='zstd')
+
+    def write(self, chunk):
+        if self.fmt == 'csv':
+            chunk[RAW_COLUMNS].to_csv(self.file, header=False, index=False)
+        else:
+            # One row group per chunk
+            chunk = chunk[RAW_COLUMNS].astype(object).where(chunk[RAW_COLUMNS].notna(), None)
+            self.writer.write_table(pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False))
+        self.rows += len(chunk)
+
+    def size(self):
+        if self.fmt == 'csv':
+            return self.file.tell()
+        return os.path.getsize(self.tmp_path)
+
+    def close(self):
+        if self.fmt == 'csv':
+            self.file.close()
+        else:
+            self.writer.close()
+
+
+def part_path(path, number):
+    """attendance_2026-01-01_2026-10-18.csv -> attendance_2026-01-01_2026-10-18_part2.csv"""
+    base, ext = os.path.splitext(path)
+    return f"{base}_part{number}{ext}"
+
+
+def write_export(path, chunks, fmt='csv', max_part_bytes=None):
+    """
+    Write ``chunks`` to ``path`` one at a time - only a single chunk is in
+    memory. CSV parts get one header row each; Parquet gets one row group
+    per chunk. With ``max_part_bytes`` a part is closed once it reaches that
+    size and the output becomes ``<name>_part1``, ``<name>_part2``, ...
+    Every part is written via tmp + rename. Returns [(path, rows), ...].
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'parquet' and not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet export (pip install pyarrow)")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(path), '~' + os.path.basename(path))
+    finished = []
+    part = None
+    try:
+        part = _ExportPart(tmp_path, fmt)
+        for chunk in chunks:
+            if max_part_bytes and part.rows and part.size() >= max_part_bytes:
+                part.close()
+                final_path = part_path(path, len(finished) + 1)
+                os.replace(tmp_path, final_path)
+                finished.append((final_path, part.rows))
+                part = _ExportPart(tmp_path, fmt)
+            part.write(chunk)
+        part.close()
+        final_path = part_path(path, len(finished) + 1) if finished else path
+        os.replace(tmp_path, final_path)
+        finished.append((final_path, part.rows))
+    except Exception:
+        if part is not None:
+            try:
+                part.close()
+            except Exception:
+                pass
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return finished
+
+
+def export_attendance(path, fmt='csv', store=None, archive_dir=None, start=None, end=None, employee_ids=None,
+                      statuses=None, chunk_rows=CHUNK_ROWS, max_part_bytes=None):
+    """Stream a filtered date range from the archive and the store into ``path``; returns [(path, rows), ...]."""
+    chunks = iter_export_chunks(store, archive_dir, start, end, employee_ids, statuses, chunk_rows)
+    return write_export(path, chunks, fmt, max_part_bytes)
+
+
+def day_after(value):
+    """Exclusive end for an inclusive last day picked in the UI."""
+    return (pd.Timestamp(to_iso_date(value)) + pd.Timedelta(days=1)).date()
+
+
+def clean_exports(export_dir, keep_days=1):
+    """Remove export files older than ``keep_days`` days, and folders left empty."""
+    if not os.path.isdir(export_dir):
+        return
+    cutoff = time.time() - keep_days * 86400
+    for root, dirs, files in os.walk(export_dir, topdown=False):
+        for fname in files:
+            path = os.path.join(root, fname)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+        if root != export_dir:
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
@@ -0,0 +1,297 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, date, time
+
+import pandas as pd
+
+# Column layout the dashboard and report code work with
+RAW_COLUMNS = ['Employee ID', 'Name', 'Date', 'Entry_Time', 'Status']
+DISPLAY_DATE_FORMAT = "%d/%m/%Y"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attendance (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,             -- ISO YYYY-MM-DD, so month/range queries are index range scans
+    employee_id TEXT NOT NULL,
+    name TEXT,
+    entry_time TEXT,                -- HH:MM or HH:MM:SS
+    status TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_attendance_date_employee ON attendance(date, employee_id);
+CREATE INDEX IF NOT EXISTS ix_attendance_employee_date ON attendance(employee_id, date);
+CREATE INDEX IF NOT EXISTS ix_attendance_date_status ON attendance(date, status);
+CREATE TABLE IF NOT EXISTS imported_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    rows INTEGER NOT NULL
+);
+"""
+
+
+def to_iso_date(value):
+    """Accept a date/datetime/Timestamp or a 'dd/mm/YYYY' / 'YYYY-MM-DD' string."""
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, date):
+        return value.isoformat()
+    value = str(value).strip()
+    for fmt in (DISPLAY_DATE_FORMAT, '%Y-%m-%d', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date: {value!r}")
+
+
+def to_time_text(value):
+    """Normalise an entry time (time, datetime, Timestamp or string) to 'HH:MM[:SS]'."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (datetime, pd.Timestamp)):
+        value = value.time()
+    if isinstance(value, str):
+        try:
+            value = time.fromisoformat(value.strip())
+        except ValueError:
+            return value.strip()
+    if isinstance(value, time):
+        return value.strftime('%H:%M:%S') if value.second else value.strftime('%H:%M')
+    return str(value).strip()
+
+
+def month_bounds(year, month):
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+class AttendanceStore:
+    """
+    Embedded SQLite system of record for attendance marks.
+
+    The database runs in WAL mode so dashboard reads never block the writer.
+    A unique index on (date, employee_id) enforces one mark per employee per
+    day, so marking is a single indexed INSERT regardless of how many rows
+    the month already holds. Each thread gets its own connection.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # Writes
+    def mark(self, emp_id, name, day, entry_time, status):
+        """Insert one mark; returns False if the employee is already marked that day."""
+        cur = self._conn().execute(
+            "INSERT OR IGNORE INTO attendance (date, employee_id, name, entry_time, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (to_iso_date(day), str(emp_id), name, to_time_text(entry_time), status, datetime.now().isoformat()),
+        )
+        return cur.rowcount == 1
+
+    def delete_day(self, day):
+        cur = self._conn().execute("DELETE FROM attendance WHERE date = ?", (to_iso_date(day),))
+        return cur.rowcount
+
+    def delete_range(self, start, end):
+        """Delete marks with ``start <= date < end``; used once they are archived."""
+        cur = self._conn().execute("DELETE FROM attendance WHERE date >= ? AND date < ?",
+                                   (to_iso_date(start), to_iso_date(end)))
+        return cur.rowcount
+
+    def apply_batch(self, operations):
+        """
+        Run ``(method_name, args)`` write operations in one transaction (one
+        fsync for the whole batch). Each operation gets its own savepoint, so
+        a failing one is rolled back alone. Returns a list of
+        ``(ok, result_or_exception)`` in input order.
+        """
+        conn = self._conn()
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for method_name, args in operations:
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append((True, getattr(self, method_name)(*args)))
+                    conn.execute("RELEASE op")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append((False, e))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return results
+
+    # Reads
+    def marked_ids(self, day):
+        rows = self._conn().execute("SELECT employee_id FROM attendance WHERE date = ?", (to_iso_date(day),))
+        return set(r[0] for r in rows)
+
+    def _records_query(self, start=None, end=None, employee_ids=None, statuses=None):
+        sql = "SELECT employee_id, name, date, entry_time, status FROM attendance WHERE 1=1"
+        params = []
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(to_iso_date(start))
+        if end is not None:
+            sql += " AND date < ?"
+            params.append(to_iso_date(end))
+        if employee_ids:
+            sql += f" AND employee_id IN ({','.join('?' * len(employee_ids))})"
+            params.extend(str(e) for e in employee_ids)
+        if statuses:
+            sql += f" AND status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        return sql + " ORDER BY date, id", params
+
+    @staticmethod
+    def _records_frame(rows):
+        df = pd.DataFrame(rows, columns=RAW_COLUMNS)
+        if not df.empty:
+            df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d').dt.strftime(DISPLAY_DATE_FORMAT)
+        return df
+
+    def records(self, start=None, end=None, employee_ids=None, statuses=None):
+        """
+        Return marks with ``start <= date < end`` (ISO strings or dates) as a
+        DataFrame in the RAW_COLUMNS layout, Date formatted as dd/mm/YYYY.
+        """
+        sql, params = self._records_query(start, end, employee_ids, statuses)
+        return self._records_frame(self._conn().execute(sql, params).fetchall())
+
+    def iter_records(self, start=None, end=None, employee_ids=None, statuses=None, chunk_rows=50000):
+        """Same query as ``records``, yielded as DataFrames of at most ``chunk_rows`` rows."""
+        sql, params = self._records_query(start, end, employee_ids, statuses)
+        # A separate cursor, so other reads on this thread's connection don't reset it
+        cursor = self._conn().cursor()
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield self._records_frame(rows)
+        finally:
+            cursor.close()
+
+    def first_date(self):
+        """Earliest ISO date in the store, or None when it is empty."""
+        return self._conn().execute("SELECT MIN(date) FROM attendance").fetchone()[0]
+
+    def month_records(self, year, month):
+        start, end = month_bounds(year, month)
+        return self.records(start, end)
+
+    # Excel is only an import/export format now
+    def import_raw_workbook(self, path):
+        """
+        One-shot import of a legacy Attendance_Raw_<Month>.xlsx workbook.
+        Imported (and exported) paths are remembered, so a restart never
+        re-reads them and a stale export cannot bring back cleared marks.
+        Returns the number of rows inserted.
+        """
+        mtime = os.path.getmtime(path)
+        conn = self._conn()
+        row = conn.execute("SELECT 1 FROM imported_files WHERE path = ?", (os.path.abspath(path),)).fetchone()
+        if row is not None:
+            return 0
+        df = pd.read_excel(path)
+        inserted = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for rec in df.to_dict('records'):
+                if pd.isna(rec.get('Employee ID')) or pd.isna(rec.get('Date')):
+                    continue
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO attendance (date, employee_id, name, entry_time, status, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (to_iso_date(rec['Date']), str(rec['Employee ID']), rec.get('Name'),
+                     to_time_text(rec.get('Entry_Time')), rec.get('Status'), datetime.now().isoformat()),
+                )
+                inserted += cur.rowcount
+            conn.execute("INSERT OR REPLACE INTO imported_files (path, mtime, rows) VALUES (?, ?, ?)",
+                         (os.path.abspath(path), mtime, inserted))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return inserted
+
+    def import_raw_workbooks(self, excel_dir):
+        total = 0
+        if not os.path.isdir(excel_dir):
+            return total
+        for fname in sorted(os.listdir(excel_dir)):
+            if fname.startswith('Attendance_Raw_') and fname.endswith('.xlsx'):
+                try:
+                    total += self.import_raw_workbook(os.path.join(excel_dir, fname))
+                except Exception as e:
+                    print(f"❌ Error importing {fname}: {e}")
+        return total
+
+    def export_excel(self, path, start=None, end=None):
+        """Write marks in the Attendance_Raw layout to an .xlsx file."""
+        df = self.records(start, end)
+        df.to_excel(path, index=False)
+        self._conn().execute("INSERT OR REPLACE INTO imported_files (path, mtime, rows) VALUES (?, ?, ?)",
+                             (os.path.abspath(path), os.path.getmtime(path), 0))
+        return path
+
+
+class AttendanceSnapshot:
+    """Parsed view of one month plus the derived 'today' lookups. Treat as read-only."""
+
+    def __init__(self, month_df, day):
+        self.month = month_df
+        self.day = day
+        self.today = month_df[month_df['Date'] == day].reset_index(drop=True)
+        self.today_counts = self.today['Status'].value_counts().to_dict()
+
+
+class SnapshotCache:
+    """
+    Process-wide cache of the current month's snapshot, keyed by
+    ``version_fn()`` - the identity of the database files (see
+    ``presence_index.store_version``). Every caller in a rerun - and every
+    session - shares one parse until the store is written to.
+    """
+
+    def __init__(self, store, version_fn):
+        self.store = store
+        self.version_fn = version_fn
+        self.lock = threading.Lock()
+        self.key = None
+        self.snapshot = None
+        self.builds = 0
+
+    def get(self, now=None):
+        now = now or datetime.now()
+        day = now.strftime(DISPLAY_DATE_FORMAT)
+        key = (self.version_fn(), now.year, now.month, day)
+        with self.lock:
+            if key != self.key:
+                self.snapshot = AttendanceSnapshot(self.store.month_records(now.year, now.month), day)
+                self.key = key
+                self.builds += 1
+            return self.snapshot
+
+    def invalidate(self):
+        with self.lock:
+            self.key = None
@@ -0,0 +1,96 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+WRITE_OPERATIONS = ('mark', 'delete_day', 'export_excel')
+
+
+class AttendanceWriter:
+    """
+    The single writer for an AttendanceStore.
+
+    Sessions submit write commands and get a Future back; one background
+    thread drains the queue and commits everything waiting in one
+    transaction (group commit), so concurrent tabs never race each other and
+    a burst of marks costs one commit instead of one per mark.
+    ``on_applied(method_name, args, result)`` runs on the writer thread after
+    each successful commit, e.g. to update the presence index.
+    """
+
+    def __init__(self, store, on_applied=None, max_batch=256):
+        self.store = store
+        self.on_applied = on_applied
+        self.max_batch = max_batch
+        self.commands = queue.Queue()
+        self.thread = None
+        self.batches = 0
+        self.operations = 0
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="attendance-writer", daemon=True)
+            self.thread.start()
+        return self
+
+    @property
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def submit(self, method_name, *args):
+        if method_name not in WRITE_OPERATIONS:
+            raise ValueError(f"Unknown write operation: {method_name}")
+        future = Future()
+        self.commands.put((method_name, args, future))
+        return future
+
+    def mark(self, emp_id, name, day, entry_time, status):
+        """Future resolving to True if inserted, False if already marked that day."""
+        return self.submit('mark', emp_id, name, day, entry_time, status)
+
+    def delete_day(self, day):
+        """Future resolving to the number of deleted marks."""
+        return self.submit('delete_day', day)
+
+    def _drain(self, first):
+        batch = [first]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.commands.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            command = self.commands.get()
+            if command is None:
+                break
+            batch = self._drain(command)
+            stop = None in batch
+            batch = [c for c in batch if c is not None]
+            try:
+                results = self.store.apply_batch([(name, args) for name, args, _ in batch])
+            except Exception as e:
+                print(f"❌ Attendance write batch failed: {e}")
+                for _, _, future in batch:
+                    future.set_exception(e)
+            else:
+                self.batches += 1
+                self.operations += len(batch)
+                for (name, args, future), (ok, result) in zip(batch, results):
+                    if not ok:
+                        future.set_exception(result)
+                        continue
+                    if self.on_applied is not None:
+                        try:
+                            self.on_applied(name, args, result)
+                        except Exception as e:
+                            print(f"⚠️ Write callback failed: {e}")
+                    future.set_result(result)
+            if stop:
+                break
+
+    def stop(self, timeout=5.0):
+        if self.is_running:
+            self.commands.put(None)
+            self.thread.join(timeout)
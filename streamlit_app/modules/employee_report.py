@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# Same office start as the time-based status prediction (9:00 AM)
+OFFICE_START_MINUTES = 9 * 60
+STATUS_COLUMNS = {
+    'Present': 'Total Present',
+    'Late': 'Total Late',
+    'Absent': 'Total Absent',
+    'Leave': 'Total Leave',
+}
+SUMMARY_COLUMNS = ['Employee ID', 'Name'] + list(STATUS_COLUMNS.values()) + [
+    'Total Entries', 'Avg Late Minutes', 'First Arrival', 'Last Arrival']
+
+
+def _parse_minutes(value):
+    """'HH:MM[:SS]' -> minutes after midnight, NaN if missing or unparseable."""
+    try:
+        parts = str(value).split(':')
+        return int(parts[0]) * 60 + int(parts[1])
+    except (ValueError, IndexError):
+        return np.nan
+
+
+def entry_minutes(entry_times):
+    """Vectorized entry time parsing - each distinct time string is parsed once."""
+    return entry_times.map({v: _parse_minutes(v) for v in entry_times.unique()}).astype(float)
+
+
+def format_minutes(minutes):
+    return minutes.map(lambda m: '' if pd.isna(m) else f"{int(m) // 60:02d}:{int(m) % 60:02d}")
+
+
+def build_monthly_summary(df, roster):
+    """
+    Per-employee monthly statistics in one grouped aggregation, left-joined
+    to the roster so employees without any entries still get a row of zeros.
+    Besides the status totals it reports the average minutes late (Late
+    entries only, measured from office start) and the earliest and latest
+    arrival time of the month.
+    """
+    minutes = entry_minutes(df['Entry_Time']) if 'Entry_Time' in df.columns else pd.Series(np.nan, index=df.index)
+    work = pd.DataFrame({'Employee ID': df['Employee ID'].astype(str), 'minutes': minutes})
+    is_late = df['Status'] == 'Late'
+    work['late_minutes'] = (minutes - OFFICE_START_MINUTES).where(is_late).clip(lower=0)
+    for status, column in STATUS_COLUMNS.items():
+        work[column] = (df['Status'] == status).astype(int)
+
+    aggregations = {column: (column, 'sum') for column in STATUS_COLUMNS.values()}
+    aggregations.update({
+        'Total Entries': ('minutes', 'size'),
+        'Avg Late Minutes': ('late_minutes', 'mean'),
+        'First Arrival': ('minutes', 'min'),
+        'Last Arrival': ('minutes', 'max'),
+    })
+    stats = work.groupby('Employee ID', sort=False).agg(**aggregations)
+
+    summary = roster[['Employee ID', 'Name']].copy()
+    summary['Employee ID'] = summary['Employee ID'].astype(str)
+    summary = summary.drop_duplicates('Employee ID').merge(stats, left_on='Employee ID', right_index=True, how='left')
+
+    count_columns = list(STATUS_COLUMNS.values()) + ['Total Entries']
+    summary[count_columns] = summary[count_columns].fillna(0).astype(int)
+    summary['Avg Late Minutes'] = summary['Avg Late Minutes'].round(1)
+    summary['First Arrival'] = format_minutes(summary['First Arrival'])
+    summary['Last Arrival'] = format_minutes(summary['Last Arrival'])
+    summary['Avg Late Minutes'] = summary['Avg Late Minutes'].astype(object).where(summary['Avg Late Minutes'].notna(), '')
+    return summary[SUMMARY_COLUMNS].reset_index(drop=True)
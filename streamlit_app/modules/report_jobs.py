@@ -0,0 +1,78 @@
+import os
+from datetime import date
+
+import pandas as pd
+
+from modules.attendance_store import AttendanceStore, RAW_COLUMNS, DISPLAY_DATE_FORMAT, month_bounds, to_iso_date
+from modules.attendance_archive import PYARROW_AVAILABLE, read_archive, to_raw_layout
+from modules.employee_report import build_monthly_summary
+from modules.styled_excel import write_styled_report
+from modules.wide_report import build_wide_frame, report_stats_lines
+
+WIDE_REPORT_TITLE = "MSN GLOBAL IT SOLUTIONS - Attendance Report"
+
+
+def monthly_report_title(label):
+    return f"MSN GLOBAL IT SOLUTIONS - Monthly Employee Report ({label})"
+
+
+def month_label(year, month):
+    """File name suffix used by the dashboard, e.g. 'October_2026'."""
+    return date(year, month, 1).strftime("%B_%Y")
+
+
+def write_wide_report(df, path):
+    """Attendance_Report layout: pivot + totals, header stats, styled in one pass."""
+    wide_df, totals = build_wide_frame(df)
+    return write_styled_report(path, wide_df, WIDE_REPORT_TITLE, report_stats_lines(len(wide_df), totals))
+
+
+def write_monthly_employee_report(df, roster, path, label):
+    summary_df = build_monthly_summary(df, roster)
+    return write_styled_report(path, summary_df, monthly_report_title(label))
+
+
+# Site data directories have the dashboard's layout: data/attendance.db, data/archive and excels/
+def site_paths(data_dir):
+    return os.path.join(data_dir, 'data', 'attendance.db'), os.path.join(data_dir, 'excels')
+
+
+def site_archive_dir(data_dir):
+    return os.path.join(data_dir, 'data', 'archive')
+
+
+def load_site_month(data_dir, year, month):
+    """
+    A month of marks from the site's store; months moved out of the store
+    come from its Parquet archive, and sites without a store from their raw
+    workbook.
+    """
+    db_path, excel_dir = site_paths(data_dir)
+    if os.path.exists(db_path):
+        df = AttendanceStore(db_path).month_records(year, month)
+        archive_dir = site_archive_dir(data_dir)
+        if df.empty and PYARROW_AVAILABLE and os.path.isdir(archive_dir):
+            start, end = month_bounds(year, month)
+            archived = read_archive(archive_dir, start, end)
+            if not archived.empty:
+                df = to_raw_layout(archived).reset_index(drop=True)
+        return df
+    raw_file = os.path.join(excel_dir, f'Attendance_Raw_{month_label(year, month)}.xlsx')
+    if os.path.exists(raw_file):
+        df = pd.read_excel(raw_file).dropna(subset=['Employee ID', 'Date'])
+        start, end = month_bounds(year, month)
+        iso = df['Date'].map(to_iso_date)
+        df = df[(iso >= start) & (iso < end)].copy()
+        df['Date'] = pd.to_datetime(iso[df.index], format='%Y-%m-%d').dt.strftime(DISPLAY_DATE_FORMAT)
+        return df[RAW_COLUMNS].reset_index(drop=True)
+    return pd.DataFrame(columns=RAW_COLUMNS)
+
+
+def load_site_roster(data_dir, df):
+    """employees_data.csv from the site directory, else the employees seen in ``df``."""
+    for candidate in (os.path.join(data_dir, 'employees_data.csv'),
+                      os.path.join(os.path.dirname(os.path.abspath(data_dir)), 'face_recognition_app', 'shared',
+                                   'employees_data.csv')):
+        if os.path.exists(candidate):
+            return pd.read_csv(candidate)
+    return df[['Employee ID', 'Name']].drop_duplicates('Employee ID')
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+def frame_hash(df, *extra):
+    """Content hash of a DataFrame (values + columns) plus any extra keys."""
+    digest = hashlib.sha1()
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    for item in extra:
+        digest.update(repr(item).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ReportScheduler:
+    """
+    Rebuilds a report in a background thread, coalescing bursts of changes.
+
+    ``request()`` is cheap and can be called on every mark or rerun: the
+    rebuild runs once changes have been quiet for ``quiet_seconds`` (but no
+    later than ``max_delay`` after the first pending request). Before
+    building, ``load_fn()`` is hashed together with ``target_fn()``; if it
+    matches the last build and the target file still exists the build is
+    skipped. ``build_fn(df)`` returns the written path or None.
+    Builds are serialized, whether they run on the background thread or
+    through ``rebuild``; a forced rebuild first calls ``reset_fn()`` so an
+    incremental builder starts from scratch.
+    """
+
+    def __init__(self, load_fn, build_fn, target_fn, quiet_seconds=3.0, max_delay=30.0, reset_fn=None):
+        self.load_fn = load_fn
+        self.build_fn = build_fn
+        self.target_fn = target_fn
+        self.reset_fn = reset_fn
+        self.quiet_seconds = quiet_seconds
+        self.max_delay = max_delay
+        self.condition = threading.Condition()
+        self.build_lock = threading.Lock()
+        self.first_request = None
+        self.last_request = None
+        self.last_hash = None
+        self.last_build_time = None
+        self.last_error = None
+        self.builds = 0
+        self.skipped = 0
+        self.thread = None
+        self.running = False
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="report-scheduler", daemon=True)
+            self.thread.start()
+        return self
+
+    def request(self):
+        now = time.time()
+        with self.condition:
+            if self.first_request is None:
+                self.first_request = now
+            self.last_request = now
+            self.condition.notify()
+
+    @property
+    def pending(self):
+        with self.condition:
+            return self.first_request is not None
+
+    def _due_at(self):
+        return min(self.last_request + self.quiet_seconds, self.first_request + self.max_delay)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and self.first_request is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                # Wait out the burst; new requests push the deadline back (up to max_delay)
+                while self.running and time.time() < self._due_at():
+                    self.condition.wait(max(0.0, self._due_at() - time.time()))
+                if not self.running:
+                    return
+                self.first_request = self.last_request = None
+            self.rebuild()
+
+    def rebuild(self, force=False):
+        """Build now on the calling thread unless the inputs are unchanged; returns True if built."""
+        with self.build_lock:
+            try:
+                if force and self.reset_fn is not None:
+                    self.reset_fn()
+                df = self.load_fn()
+                target = self.target_fn()
+                content_hash = frame_hash(df, target)
+                if not force and content_hash == self.last_hash and os.path.exists(target):
+                    self.skipped += 1
+                    return False
+                if df.empty:
+                    return False
+                if self.build_fn(df):
+                    self.last_hash = content_hash
+                    self.last_build_time = time.time()
+                    self.builds += 1
+                    self.last_error = None
+                    return True
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ Background report rebuild failed: {e}")
+            return False
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
@@ -0,0 +1,94 @@
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+# Black, red, white report theme as named styles: each is stored once in the
+# workbook and cells only reference it by name
+_THIN = Side(style='thin', color='000000')
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_CENTER = Alignment(horizontal="center", vertical="center")
+
+
+def report_styles():
+    return [
+        NamedStyle(name="msn_title", font=Font(size=16, bold=True, color="FF0000", name="Calibri"),
+                   fill=PatternFill("solid", fgColor="000000"), alignment=_CENTER),
+        NamedStyle(name="msn_stat", font=Font(size=12, bold=True, color="FFFFFF", name="Calibri"),
+                   fill=PatternFill("solid", fgColor="1C1C1C"),
+                   alignment=Alignment(horizontal="left", vertical="center")),
+        NamedStyle(name="msn_header", font=Font(bold=True, color="FFFFFF", name="Calibri"),
+                   fill=PatternFill("solid", fgColor="C80000"), alignment=_CENTER, border=_BORDER),
+        NamedStyle(name="msn_row_dark", font=Font(name="Calibri", color="FFFFFF"),
+                   fill=PatternFill("solid", fgColor="1C1C1C"), alignment=_CENTER, border=_BORDER),
+        NamedStyle(name="msn_row_light", font=Font(name="Calibri", color="000000"),
+                   fill=PatternFill("solid", fgColor="EDEDED"), alignment=_CENTER, border=_BORDER),
+    ]
+
+
+def column_widths(df):
+    """Width per column from the longest header or value (+3), computed column-wise."""
+    widths = []
+    for col in df.columns:
+        values = df[col]
+        longest = values.where(values.notna(), '').astype(str).str.len().max() if len(values) else 0
+        widths.append(max(len(str(col)), int(longest or 0)) + 3)
+    return widths
+
+
+def _cell_value(value):
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str) and pd.isna(value):
+        return None
+    return value
+
+
+def write_styled_report(path, df, title, stats_lines=(), sheet_name="Employee Report"):
+    """
+    Write ``df`` as a styled report in a single streaming pass: title row,
+    optional statistics rows, header row, then body rows with alternating
+    fills. Uses openpyxl's write-only mode, so rows are flushed to disk as
+    they are written and memory does not grow with the size of the report.
+    The file is written to a temporary name and renamed into place.
+    """
+    n_cols = max(1, len(df.columns))
+    wb = Workbook(write_only=True)
+    for style in report_styles():
+        wb.add_named_style(style)
+    ws = wb.create_sheet(sheet_name)
+
+    # Everything that has to precede the rows in the sheet XML
+    for i, width in enumerate(column_widths(df), 1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+    last_col = get_column_letter(n_cols)
+
+    def styled(value, style):
+        # Cells reference the workbook's named style instead of carrying their own formatting
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    row_idx = 1
+    ws.append([styled(title, "msn_title")])
+    if n_cols > 1:
+        ws.merged_cells.add(CellRange(f"A{row_idx}:{last_col}{row_idx}"))
+    for line in stats_lines:
+        row_idx += 1
+        ws.append([styled(line, "msn_stat")])
+        if n_cols > 1:
+            ws.merged_cells.add(CellRange(f"A{row_idx}:{last_col}{row_idx}"))
+
+    ws.append([styled(str(col), "msn_header") for col in df.columns])
+    for i, row in enumerate(df.itertuples(index=False, name=None)):
+        style = "msn_row_dark" if i % 2 == 0 else "msn_row_light"
+        ws.append([styled(_cell_value(value), style) for value in row])
+
+    tmp_path = os.path.join(os.path.dirname(path), '~' + os.path.basename(path))
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,173 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# Layout of Attendance_Report_<Month>.xlsx: title, six statistics rows, header, one row per employee
+TITLE_ROW = 1
+STATS_FIRST_ROW = 2
+HEADER_ROW = 8
+FIRST_DATA_ROW = 9
+TOTAL_COLUMNS = {
+    'Present': 'Total Present',
+    'Late': 'Total Late',
+    'Absent': 'Total Absent',
+    'Leave': 'Total Leaves',
+}
+
+
+def date_label(value):
+    """Column header for a date, e.g. 'October 5, 2026'."""
+    ts = pd.to_datetime(value, format='%d/%m/%Y') if isinstance(value, str) else pd.Timestamp(value)
+    return ts.strftime('%B %#d, %Y' if os.name == 'nt' else '%B %-d, %Y')
+
+
+def report_stats_lines(total_employees, totals, generated=None):
+    """The six statistics lines shown under the report title."""
+    generated = generated or datetime.now()
+    return [
+        f"Total Employees: {total_employees}",
+        f"Total Present: {totals.get('Present', 0)}",
+        f"Total Late: {totals.get('Late', 0)}",
+        f"Total Absent: {totals.get('Absent', 0)}",
+        f"Total Leaves: {totals.get('Leave', 0)}",
+        f"Report Generated: {generated.strftime('%B %d, %Y at %H:%M')}",
+    ]
+
+
+def build_wide_frame(df):
+    """
+    Pivot raw-layout marks to one row per employee and one column per day,
+    with the four total columns. Totals come from a single grouped count of
+    (employee, status); the org-wide counts for the header statistics are
+    its column sums, so nothing is re-counted from the cells.
+    Returns (wide_df, totals) where totals maps status -> count.
+    """
+    # Format each distinct date once
+    labels = df['Date'].map({d: date_label(d) for d in df['Date'].unique()})
+
+    # One status per employee per day (the store enforces it; keep the first otherwise)
+    cells = pd.DataFrame({'Employee ID': df['Employee ID'], 'Name': df['Name'],
+                          'Date_Display': labels, 'Status': df['Status']})
+    cells = cells.drop_duplicates(['Employee ID', 'Name', 'Date_Display'])
+    wide_df = cells.set_index(['Employee ID', 'Name', 'Date_Display'])['Status'].unstack('Date_Display')
+    wide_df.columns.name = None
+
+    counts = cells.groupby(['Employee ID', 'Name', 'Status']).size().unstack('Status', fill_value=0)
+    counts = counts.reindex(index=wide_df.index, columns=list(TOTAL_COLUMNS), fill_value=0)
+    for status, column_name in TOTAL_COLUMNS.items():
+        wide_df[column_name] = counts[status].astype(int)
+
+    wide_df = wide_df.fillna('').reset_index()
+    totals = {status: int(counts[status].sum()) for status in TOTAL_COLUMNS}
+    return wide_df, totals
+
+
+def diff_marks(previous, current):
+    """
+    Marks that differ between two raw-layout frames, keyed on (Employee ID,
+    Date). Returns a frame with Employee ID, Date and Status, where Status is
+    None for a mark that was removed.
+    """
+    key = ['Employee ID', 'Date']
+    prev = previous.drop_duplicates(key).set_index(key)['Status']
+    cur = current.drop_duplicates(key).set_index(key)['Status']
+    prev, cur = prev.align(cur)
+    changed = prev.ne(cur) & ~(prev.isna() & cur.isna())
+    changes = cur[changed].reset_index()
+    return changes.astype(object).where(changes.notna(), None)
+
+
+def patch_wide_report(path, df, changes):
+    """
+    Apply ``changes`` (from ``diff_marks``) to an existing report in place:
+    the changed status cells, the totals of the employees involved and the
+    statistics rows. Existing cell styles are kept. Returns False - without
+    touching the file - when a change needs a row or column the report does
+    not have yet, so the caller can fall back to a full rebuild.
+    """
+    wb = load_workbook(path)
+    ws = wb.active
+    columns = {}
+    for col in range(1, ws.max_column + 1):
+        value = ws.cell(row=HEADER_ROW, column=col).value
+        if value is not None:
+            columns[str(value)] = col
+    if 'Employee ID' not in columns or any(name not in columns for name in TOTAL_COLUMNS.values()):
+        return False
+    id_col = columns['Employee ID']
+    rows = {}
+    for row in range(FIRST_DATA_ROW, ws.max_row + 1):
+        value = ws.cell(row=row, column=id_col).value
+        if value is not None:
+            rows[str(value)] = row
+
+    # Resolve every change first so a layout miss leaves the file untouched
+    cells = []
+    for change in changes.itertuples(index=False):
+        emp_id, label = str(change[0]), date_label(change[1])
+        if emp_id not in rows or label not in columns:
+            return False
+        cells.append((rows[emp_id], columns[label], change[2]))
+    for row, col, status in cells:
+        ws.cell(row=row, column=col).value = status
+
+    # Totals for the employees whose cells changed
+    dirty = set(str(c[0]) for c in changes.itertuples(index=False))
+    emp_ids = df['Employee ID'].astype(str)
+    counts = df[emp_ids.isin(dirty)].groupby([emp_ids[emp_ids.isin(dirty)], 'Status']).size()
+    for emp_id in dirty:
+        for status, column_name in TOTAL_COLUMNS.items():
+            ws.cell(row=rows[emp_id], column=columns[column_name]).value = int(counts.get((emp_id, status), 0))
+
+    # Header statistics
+    totals = df['Status'].value_counts().to_dict()
+    for i, line in enumerate(report_stats_lines(len(rows), totals)):
+        ws.cell(row=STATS_FIRST_ROW + i, column=1).value = line
+
+    tmp_path = os.path.join(os.path.dirname(path), '~' + os.path.basename(path))
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+    return True
+
+
+class WideReportUpdater:
+    """
+    Keeps the monthly wide report current with the fewest writes possible.
+
+    The first update (and any update after a restart, a month change or a
+    deleted report) runs ``full_build_fn(df)``. Later updates diff against
+    the frame the report was last built from and patch only those cells;
+    a new employee or a new day falls back to a full rebuild.
+    """
+
+    def __init__(self, full_build_fn):
+        self.full_build_fn = full_build_fn
+        self.previous = None
+        self.path = None
+        self.full_builds = 0
+        self.patches = 0
+
+    def invalidate(self):
+        self.previous = None
+
+    def update(self, df, path):
+        if self.previous is not None and self.path == path and os.path.exists(path):
+            changes = diff_marks(self.previous, df)
+            if changes.empty:
+                return path
+            try:
+                if patch_wide_report(path, df, changes):
+                    self.previous = df
+                    self.patches += 1
+                    return path
+            except Exception as e:
+                print(f"⚠️ Report patch failed, rebuilding: {e}")
+        result = self.full_build_fn(df)
+        if result:
+            self.previous = df
+            self.path = path
+            self.full_builds += 1
+            return path
+        return None